@@ -1,3 +1,4 @@
+import logging
 import os
 import signal
 import threading
@@ -22,6 +23,9 @@ from relaymesh.worker import (
     WithLogger,
 )
 
+logging.basicConfig(level=logging.INFO, format="example-worker %(message)s")
+logger = logging.getLogger("example-worker")
+
 stop = threading.Event()
 
 
@@ -57,16 +61,13 @@ if example_timeout > 0:
     timer.start()
 
 if not api_key:
-    print("RELAYMESH_API_KEY not set; skipping worker run.")
+    logger.info("RELAYMESH_API_KEY not set; skipping worker run.")
     raise SystemExit(0)
 
 
 class ExampleLogger:
     def printf(self, fmt, *args):
-        rendered = fmt
-        for arg in args:
-            rendered = rendered.replace("%s", str(arg), 1)
-        print(f"example-worker {rendered}")
+        logger.info(fmt, *args)
 
     def Printf(self, fmt, *args):
         self.printf(fmt, *args)
@@ -74,14 +75,20 @@ class ExampleLogger:
 
 class ExampleListener(Listener):
     def on_message_start(self, ctx, evt):
-        print(
-            f"listener start log_id={evt.metadata.get('log_id', '')} provider={evt.provider} topic={evt.topic}"
+        logger.info(
+            "listener start log_id=%s provider=%s topic=%s",
+            evt.metadata.get("log_id", ""),
+            evt.provider,
+            evt.topic,
         )
 
     def on_message_finish(self, ctx, evt, err=None):
         status = "failed" if err else "success"
-        print(
-            f"listener finish log_id={evt.metadata.get('log_id', '')} status={status} err={err or ''}"
+        logger.info(
+            "listener finish log_id=%s status=%s err=%s",
+            evt.metadata.get("log_id", ""),
+            status,
+            err or "",
         )
 
     def on_error(self, ctx, evt, err):
@@ -90,7 +97,9 @@ class ExampleListener(Listener):
         if evt is not None:
             provider = evt.provider
             log_id = evt.metadata.get("log_id", "")
-        print(f"listener error log_id={log_id} provider={provider} err={err}")
+        logger.info(
+            "listener error log_id=%s provider=%s err=%s", log_id, provider, err
+        )
 
 
 options = [
@@ -110,21 +119,16 @@ else:
 
 
 def repository_from_event(evt):
-    normalized = getattr(evt, "normalized", None)
-    if not normalized or not isinstance(normalized, dict):
-        return "", ""
-    repo_value = normalized.get("repository")
-    if not isinstance(repo_value, dict):
+    try:
+        repo = evt.normalized["repository"]
+        full_name = repo.get("full_name") or ""
+        if "/" in full_name:
+            owner, name = full_name.split("/", 1)
+            if owner and name:
+                return owner, name
+        return (repo.get("owner") or {}).get("login", ""), repo.get("name", "")
+    except (AttributeError, KeyError, TypeError):
         return "", ""
-    full_name = repo_value.get("full_name", "")
-    if isinstance(full_name, str) and "/" in full_name:
-        parts = full_name.strip().split("/", 1)
-        if len(parts) == 2 and parts[0] and parts[1]:
-            return parts[0], parts[1]
-    name = repo_value.get("name", "")
-    owner_map = repo_value.get("owner")
-    owner = owner_map.get("login", "") if isinstance(owner_map, dict) else ""
-    return str(owner).strip(), str(name).strip()
 
 
 def first_line(s):
@@ -135,18 +139,25 @@ def first_line(s):
 
 def handle(ctx, evt):
     provider_name = (evt.provider or "").strip().lower()
-    print(
-        f"handler topic={evt.topic} provider={provider_name} type={evt.type} retry_count={retry_count} concurrency={concurrency}"
+    logger.info(
+        "handler topic=%s provider=%s type=%s retry_count=%d concurrency=%d",
+        evt.topic,
+        provider_name,
+        evt.type,
+        retry_count,
+        concurrency,
     )
 
     if provider_name == "github":
         gh = GitHubClient(evt)
         if not gh:
-            print("github client not available (installation may not be configured)")
+            logger.info(
+                "github client not available (installation may not be configured)"
+            )
             return
         owner, repo = repository_from_event(evt)
         if not owner or not repo:
-            print("repository info missing in payload; skipping github read")
+            logger.info("repository info missing in payload; skipping github read")
             return
         try:
             commits = gh.request_json(
@@ -154,8 +165,8 @@ def handle(ctx, evt):
             )
             if not isinstance(commits, list):
                 commits = []
-            print(f"github commits count={len(commits)}")
-            for i, c in enumerate(commits):
+            summary = []
+            for c in commits:
                 sha = str(c.get("sha", ""))[:7] if isinstance(c, dict) else ""
                 commit_obj = c.get("commit", {}) if isinstance(c, dict) else {}
                 msg = first_line(
@@ -163,19 +174,26 @@ def handle(ctx, evt):
                     if isinstance(commit_obj, dict)
                     else ""
                 )
-                print(f"  commit[{i + 1}] sha={sha} message={msg}")
+                summary.append(f"{sha} {msg}")
+            logger.info(
+                "github commits count=%d commits=%s", len(commits), " | ".join(summary)
+            )
         except Exception as err:
-            print(f"github list commits failed owner={owner} repo={repo} err={err}")
+            logger.info(
+                "github list commits failed owner=%s repo=%s err=%s", owner, repo, err
+            )
         return
 
     if provider_name == "gitlab":
         gl = GitLabClient(evt)
         if not gl:
-            print("gitlab client not available (installation may not be configured)")
+            logger.info(
+                "gitlab client not available (installation may not be configured)"
+            )
             return
         owner, repo = repository_from_event(evt)
         if not owner or not repo:
-            print("repository info missing in payload; skipping gitlab read")
+            logger.info("repository info missing in payload; skipping gitlab read")
             return
         try:
             project = quote(f"{owner}/{repo}", safe="")
@@ -184,23 +202,28 @@ def handle(ctx, evt):
             )
             if not isinstance(commits, list):
                 commits = []
-            print(f"gitlab commits count={len(commits)}")
-            for i, c in enumerate(commits):
+            summary = []
+            for c in commits:
                 sha = str(c.get("short_id", "")) if isinstance(c, dict) else ""
                 msg = first_line(c.get("title", "") if isinstance(c, dict) else "")
-                print(f"  commit[{i + 1}] sha={sha} message={msg}")
+                summary.append(f"{sha} {msg}")
+            logger.info(
+                "gitlab commits count=%d commits=%s", len(commits), " | ".join(summary)
+            )
         except Exception as err:
-            print(f"gitlab list commits failed err={err}")
+            logger.info("gitlab list commits failed err=%s", err)
         return
 
     if provider_name == "bitbucket":
         bb = BitbucketClient(evt)
         if not bb:
-            print("bitbucket client not available (installation may not be configured)")
+            logger.info(
+                "bitbucket client not available (installation may not be configured)"
+            )
             return
         owner, repo = repository_from_event(evt)
         if not owner or not repo:
-            print("repository info missing in payload; skipping bitbucket read")
+            logger.info("repository info missing in payload; skipping bitbucket read")
             return
         try:
             result = bb.request_json(
@@ -209,16 +232,21 @@ def handle(ctx, evt):
             values = result.get("values", []) if isinstance(result, dict) else []
             if not isinstance(values, list):
                 values = []
-            print(f"bitbucket commits count={len(values)}")
-            for i, c in enumerate(values):
+            summary = []
+            for c in values:
                 sha = str(c.get("hash", ""))[:7] if isinstance(c, dict) else ""
                 msg = first_line(c.get("message", "") if isinstance(c, dict) else "")
-                print(f"  commit[{i + 1}] sha={sha} message={msg}")
+                summary.append(f"{sha} {msg}")
+            logger.info(
+                "bitbucket commits count=%d commits=%s",
+                len(values),
+                " | ".join(summary),
+            )
         except Exception as err:
-            print(f"bitbucket list commits failed err={err}")
+            logger.info("bitbucket list commits failed err=%s", err)
         return
 
-    print(f"unsupported provider={provider_name}; skipping scm call")
+    logger.info("unsupported provider=%s; skipping scm call", provider_name)
 
 
 wk.HandleRule(rule_id, handle)
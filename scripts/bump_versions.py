@@ -5,12 +5,17 @@ import re
 import sys
 from pathlib import Path
 
+SEMVER = re.compile(r"\d+\.\d+\.\d+(?:[-+][A-Za-z0-9.]+)?")
+CHART_VERSION_LINE = re.compile(r"(?m)^version:\s*.*$")
+CHART_APP_VERSION_LINE = re.compile(r"(?m)^appVersion:\s*.*$")
+PYTHON_DEFAULT_VERSION = re.compile(r'return raw or "[^"]+"')
+
 
 def normalize_version(raw: str) -> str:
     version = raw.strip()
     if version.startswith("v"):
         version = version[1:]
-    if not re.fullmatch(r"\d+\.\d+\.\d+(?:[-+][A-Za-z0-9.]+)?", version):
+    if not SEMVER.fullmatch(version):
         raise SystemExit(f"invalid version: {raw}")
     return version
 
@@ -18,8 +23,8 @@ def normalize_version(raw: str) -> str:
 def update_chart(root: Path, version: str) -> None:
     chart_path = root / "charts" / "githook" / "Chart.yaml"
     text = chart_path.read_text(encoding="utf-8")
-    text = re.sub(r"(?m)^version:\s*.*$", f"version: {version}", text)
-    text = re.sub(r"(?m)^appVersion:\s*.*$", f'appVersion: "{version}"', text)
+    text = CHART_VERSION_LINE.sub(f"version: {version}", text)
+    text = CHART_APP_VERSION_LINE.sub(f'appVersion: "{version}"', text)
     chart_path.write_text(text, encoding="utf-8")
 
 
@@ -41,7 +46,7 @@ def update_typescript(root: Path, version: str) -> None:
 def update_python(root: Path, version: str) -> None:
     setup_path = root / "sdk" / "python" / "worker" / "setup.py"
     text = setup_path.read_text(encoding="utf-8")
-    text = re.sub(r'return raw or "[^"]+"', f'return raw or "{version}"', text)
+    text = PYTHON_DEFAULT_VERSION.sub(f'return raw or "{version}"', text)
     setup_path.write_text(text, encoding="utf-8")
 
 
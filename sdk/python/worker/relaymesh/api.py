@@ -1,15 +1,33 @@
 import datetime
-import json
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-
+import functools
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+import requests
+
+try:
+    from ciso8601 import parse_datetime as _ciso8601_parse
+except ImportError:  # optional speedup
+    _ciso8601_parse = None
+
+from . import jsonutil
+from .compat import DATACLASS_SLOTS
 from .context import WorkerContext
-from .oauth2 import OAuth2Config, oauth2_token_from_config, resolve_oauth2_config
+from .oauth2 import (
+    OAuth2Config,
+    oauth2_token_from_config,
+    reload_default_oauth2_config,
+    resolve_oauth2_config,
+)
+from .transport import new_session
 
+DEFAULT_RECORD_CACHE_TTL_SECONDS = 30.0
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class RuleRecord:
     id: str
     when: str
@@ -17,7 +35,7 @@ class RuleRecord:
     driver_id: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DriverRecord:
     id: str
     name: str
@@ -25,7 +43,7 @@ class DriverRecord:
     enabled: bool
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class InstallationRecord:
     provider: str
     account_id: str
@@ -40,7 +58,7 @@ class InstallationRecord:
     expires_at: Optional[datetime.datetime] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SCMClientRecord:
     provider: str
     api_base_url: str
@@ -56,11 +74,59 @@ class APIClientOptions:
     oauth2_config: Optional[OAuth2Config] = None
     tenant_id: str = ""
     timeout: float = 10.0
+    # Resolved auth strategy and header template for these options; rebuilt
+    # when api_key, oauth2_config or the environment changes. Not an argument.
+    auth_cache: "_AuthCache" = field(
+        default_factory=lambda: _AuthCache(), init=False, repr=False, compare=False
+    )
+
+
+class _TTLCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl = max(0.0, float(ttl_seconds))
+        self.lock = threading.Lock()
+        self.items: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if self.ttl <= 0:
+            return None
+        with self.lock:
+            entry = self.items.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self.items.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self.items[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self.lock:
+            if key is None:
+                self.items.clear()
+            else:
+                self.items.pop(key, None)
+
+
+# Cached records are shared across lookups; callers get their own copy,
+# emit list included.
+def _copy_rule(rule: RuleRecord) -> RuleRecord:
+    return replace(rule, emit=list(rule.emit))
 
 
 class RulesClient:
-    def __init__(self, opts: APIClientOptions) -> None:
+    def __init__(
+        self,
+        opts: APIClientOptions,
+        cache_ttl_seconds: float = DEFAULT_RECORD_CACHE_TTL_SECONDS,
+    ) -> None:
         self.opts = opts
+        self.cache = _TTLCache(cache_ttl_seconds)
 
     def list_rules(self, ctx: Optional[WorkerContext] = None) -> List[RuleRecord]:
         payload = _post_json(self.opts, "/cloud.v1.RulesService/ListRules", {}, ctx)
@@ -79,36 +145,48 @@ class RulesClient:
         trimmed = (rule_id or "").strip()
         if not trimmed:
             raise ValueError("rule id is required")
+        cache_key = (_tenant_for(self.opts, ctx), trimmed)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return _copy_rule(cached)
         payload = _post_json(
             self.opts, "/cloud.v1.RulesService/GetRule", {"id": trimmed}, ctx
         )
         record = _read_object(payload, "rule")
         if not record:
             raise ValueError(f"rule not found: {trimmed}")
-        return RuleRecord(
+        rule = RuleRecord(
             id=_read_string(record, "id"),
             when=_read_string(record, "when"),
             emit=_read_string_array(record, "emit"),
             driver_id=_read_string(record, "driver_id", "driverId"),
         )
+        self.cache.set(cache_key, _copy_rule(rule))
+        return rule
+
+    def invalidate(
+        self, rule_id: str = "", ctx: Optional[WorkerContext] = None
+    ) -> None:
+        trimmed = (rule_id or "").strip()
+        if not trimmed:
+            self.cache.invalidate()
+            return
+        self.cache.invalidate((_tenant_for(self.opts, ctx), trimmed))
 
 
 class DriversClient:
-    def __init__(self, opts: APIClientOptions) -> None:
+    def __init__(
+        self,
+        opts: APIClientOptions,
+        cache_ttl_seconds: float = DEFAULT_RECORD_CACHE_TTL_SECONDS,
+    ) -> None:
         self.opts = opts
+        self.cache = _TTLCache(cache_ttl_seconds)
 
     def list_drivers(self, ctx: Optional[WorkerContext] = None) -> List[DriverRecord]:
         payload = _post_json(self.opts, "/cloud.v1.DriversService/ListDrivers", {}, ctx)
         raw_drivers = _read_array(payload, "drivers")
-        return [
-            DriverRecord(
-                id=_read_string(record, "id"),
-                name=_read_string(record, "name"),
-                config_json=_read_string(record, "config_json", "configJson"),
-                enabled=_read_bool(record, "enabled"),
-            )
-            for record in raw_drivers
-        ]
+        return [_normalize_driver(record) for record in raw_drivers]
 
     def get_driver_by_id(
         self, driver_id: str, ctx: Optional[WorkerContext] = None
@@ -116,11 +194,35 @@ class DriversClient:
         trimmed = (driver_id or "").strip()
         if not trimmed:
             raise ValueError("driver id is required")
-        drivers = self.list_drivers(ctx)
-        for record in drivers:
-            if (record.id or "").strip() == trimmed:
-                return record
-        return None
+        record = self._drivers_by_id(ctx).get(trimmed)
+        # The index is cached; hand out a copy so callers cannot edit it.
+        return None if record is None else replace(record)
+
+    def invalidate(
+        self, driver_id: str = "", ctx: Optional[WorkerContext] = None
+    ) -> None:
+        # Drivers are indexed per tenant from a single ListDrivers call, so
+        # busting one id drops that tenant's index and the next lookup
+        # refetches it.
+        if not (driver_id or "").strip():
+            self.cache.invalidate()
+            return
+        self.cache.invalidate(_tenant_for(self.opts, ctx))
+
+    def _drivers_by_id(self, ctx: Optional[WorkerContext]) -> Dict[str, DriverRecord]:
+        tenant_id = _tenant_for(self.opts, ctx)
+        cached = self.cache.get(tenant_id)
+        if cached is not None:
+            return cached
+        payload = _post_json(self.opts, "/cloud.v1.DriversService/ListDrivers", {}, ctx)
+        index: Dict[str, DriverRecord] = {}
+        for raw in _read_array(payload, "drivers"):
+            record = _normalize_driver(raw)
+            record_id = (record.id or "").strip()
+            if record_id:
+                index[record_id] = record
+        self.cache.set(tenant_id, index)
+        return index
 
 
 class EventLogsClient:
@@ -213,6 +315,7 @@ class SCMClientsClient:
         return _normalize_scm_client(record)
 
 
+@functools.lru_cache(maxsize=32)
 def resolve_endpoint(explicit: str) -> str:
     trimmed = (explicit or "").strip()
     if trimmed:
@@ -226,6 +329,7 @@ def resolve_endpoint(explicit: str) -> str:
     return "http://localhost:8080"
 
 
+@functools.lru_cache(maxsize=32)
 def resolve_api_key(explicit: str) -> str:
     trimmed = (explicit or "").strip()
     if trimmed:
@@ -233,6 +337,7 @@ def resolve_api_key(explicit: str) -> str:
     return _env_value("RELAYMESH_API_KEY")
 
 
+@functools.lru_cache(maxsize=32)
 def resolve_tenant_id(explicit: str) -> str:
     trimmed = (explicit or "").strip()
     if trimmed:
@@ -240,6 +345,15 @@ def resolve_tenant_id(explicit: str) -> str:
     return _env_value("RELAYMESH_TENANT_ID")
 
 
+def _normalize_driver(record: Dict[str, Any]) -> DriverRecord:
+    return DriverRecord(
+        id=_read_string(record, "id"),
+        name=_read_string(record, "name"),
+        config_json=_read_string(record, "config_json", "configJson"),
+        enabled=_read_bool(record, "enabled"),
+    )
+
+
 def _normalize_installation(record: Dict[str, Any]) -> InstallationRecord:
     return InstallationRecord(
         provider=_read_string(record, "provider"),
@@ -270,6 +384,12 @@ def _normalize_scm_client(record: Dict[str, Any]) -> SCMClientRecord:
     )
 
 
+# Shared across every API client so keep-alive connections to the control
+# plane are reused instead of paying a TCP/TLS handshake per call. The
+# session stores no cookies, so nothing carries over between tenants.
+_SESSION = new_session(pool_connections=4, pool_maxsize=32)
+
+
 def _post_json(
     opts: APIClientOptions,
     path: str,
@@ -280,29 +400,26 @@ def _post_json(
     if not base:
         raise ValueError("base url is required")
     url = f"{base}{path}"
-    headers: Dict[str, str] = {"Content-Type": "application/json"}
-    _apply_auth_headers(headers, opts, ctx)
-    tenant_id = (ctx.tenant_id if ctx else "") or (opts.tenant_id or "")
-    if tenant_id:
-        headers["X-Tenant-ID"] = tenant_id
-
-    data = json.dumps(body or {}).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+    headers = _request_headers(opts, ctx)
+
+    data = jsonutil.dumps(body or {})
     timeout = opts.timeout if opts.timeout and opts.timeout > 0 else 10.0
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            payload = resp.read()
-    except urllib.error.HTTPError as err:
-        raw = err.read() if err.fp else b""
+        resp = _SESSION.post(url, data=data, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        payload = resp.content
+    except requests.HTTPError as err:
+        status = err.response.status_code if err.response is not None else 0
+        raw = err.response.content if err.response is not None else b""
         message = raw.decode("utf-8", errors="replace")
-        raise RuntimeError(f"api request failed ({err.code}): {message}") from err
-    except urllib.error.URLError as err:
+        raise RuntimeError(f"api request failed ({status}): {message}") from err
+    except requests.RequestException as err:
         raise RuntimeError(f"api request failed: {err}") from err
 
     if not payload:
         return {}
     try:
-        decoded = json.loads(payload.decode("utf-8"))
+        decoded = jsonutil.loads(payload)
         if isinstance(decoded, dict):
             return decoded
     except Exception:
@@ -310,17 +427,103 @@ def _post_json(
     return {}
 
 
-def _apply_auth_headers(
-    headers: Dict[str, str], opts: APIClientOptions, ctx: Optional[WorkerContext]
-) -> None:
+def _tenant_for(opts: APIClientOptions, ctx: Optional[WorkerContext]) -> str:
+    return (ctx.tenant_id if ctx else "") or (opts.tenant_id or "")
+
+
+# Bumped by _invalidate_env_cache so every options object re-resolves its
+# auth strategy against the current environment on its next request.
+_env_generation = 0
+
+
+def _invalidate_env_cache() -> None:
+    global _env_generation
+    _env_generation += 1
+    resolve_endpoint.cache_clear()
+    resolve_api_key.cache_clear()
+    resolve_tenant_id.cache_clear()
+    _env_value.cache_clear()
+    reload_default_oauth2_config()
+
+
+class _AuthState:
+    def __init__(
+        self, static_headers: Dict[str, str], oauth2_config: Optional[OAuth2Config]
+    ) -> None:
+        self.static_headers = static_headers
+        self.oauth2_config = oauth2_config
+
+    def apply_bearer(
+        self, headers: Dict[str, str], ctx: Optional[WorkerContext]
+    ) -> None:
+        if self.oauth2_config is None:
+            return
+        token = oauth2_token_from_config(ctx, self.oauth2_config)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+
+class _AuthEntry(NamedTuple):
+    generation: int
+    api_key: str
+    oauth2_config: Optional[OAuth2Config]
+    state: _AuthState
+
+
+class _HeadersEntry(NamedTuple):
+    auth: _AuthState
+    tenant_id: str
+    template: Dict[str, str]
+
+
+class _AuthCache:
+    # Entries are replaced whole, so threads sharing one options object never
+    # see a half-updated cache.
+    __slots__ = ("auth", "headers")
+
+    def __init__(self) -> None:
+        self.auth: Optional[_AuthEntry] = None
+        self.headers: Optional[_HeadersEntry] = None
+
+
+# The auth strategy is resolved once per options object and rebuilt when
+# api_key/oauth2_config change or the env cache is invalidated.
+def _auth_state(opts: APIClientOptions) -> _AuthState:
+    cache = opts.auth_cache
+    entry = cache.auth
+    if (
+        entry is not None
+        and entry.generation == _env_generation
+        and entry.api_key == opts.api_key
+        and entry.oauth2_config is opts.oauth2_config
+    ):
+        return entry.state
     api_key = resolve_api_key(opts.api_key)
     if api_key:
-        headers["X-API-Key"] = api_key
-        return
-    cfg = opts.oauth2_config or resolve_oauth2_config(None)
-    token = oauth2_token_from_config(ctx, cfg)
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+        state = _AuthState({"X-API-Key": api_key}, None)
+    else:
+        state = _AuthState({}, opts.oauth2_config or resolve_oauth2_config(None))
+    cache.auth = _AuthEntry(_env_generation, opts.api_key, opts.oauth2_config, state)
+    return state
+
+
+def _request_headers(
+    opts: APIClientOptions, ctx: Optional[WorkerContext]
+) -> Dict[str, str]:
+    auth = _auth_state(opts)
+    tenant_id = _tenant_for(opts, ctx)
+    cache = opts.auth_cache
+    entry = cache.headers
+    if entry is None or entry.auth is not auth or entry.tenant_id != tenant_id:
+        template = {"Content-Type": "application/json"}
+        template.update(auth.static_headers)
+        if tenant_id:
+            template["X-Tenant-ID"] = tenant_id
+        entry = _HeadersEntry(auth, tenant_id, template)
+        cache.headers = entry
+    headers = entry.template.copy()
+    auth.apply_bearer(headers, ctx)
+    return headers
 
 
 def _parse_datetime(record: Dict[str, Any], *keys: str) -> Optional[datetime.datetime]:
@@ -328,8 +531,7 @@ def _parse_datetime(record: Dict[str, Any], *keys: str) -> Optional[datetime.dat
         value = record.get(key)
         if isinstance(value, str) and value:
             try:
-                normalized = value.replace("Z", "+00:00")
-                dt = datetime.datetime.fromisoformat(normalized)
+                dt = _parse_iso8601(value)
                 if dt.tzinfo is None:
                     dt = dt.replace(tzinfo=datetime.timezone.utc)
                 return dt
@@ -352,51 +554,47 @@ def _parse_datetime(record: Dict[str, Any], *keys: str) -> Optional[datetime.dat
     return None
 
 
-def _read_string(record: Dict[str, Any], *keys: str) -> str:
-    for key in keys:
-        value = record.get(key)
-        if isinstance(value, str):
-            return value
-    return ""
+def _parse_iso8601(value: str) -> datetime.datetime:
+    if _ciso8601_parse is not None:
+        return _ciso8601_parse(value)
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 
-def _read_string_array(record: Dict[str, Any], *keys: str) -> List[str]:
-    for key in keys:
-        value = record.get(key)
-        if isinstance(value, list):
-            return [str(entry) for entry in value if entry is not None]
-    return []
+def _read_string(record: Dict[str, Any], key: str, alt: str = "") -> str:
+    value = record.get(key)
+    if type(value) is not str and alt:
+        value = record.get(alt)
+    return value if type(value) is str else ""
 
 
-def _read_bool(record: Dict[str, Any], *keys: str) -> bool:
-    for key in keys:
-        value = record.get(key)
-        if isinstance(value, bool):
-            return value
-    return False
+def _read_string_array(record: Dict[str, Any], key: str) -> List[str]:
+    value = record.get(key)
+    if type(value) is not list:
+        return []
+    # An all-string list only needs a shallow copy, not a per-element pass;
+    # the copy keeps the record from aliasing the decoded payload.
+    if all(type(entry) is str for entry in value):
+        return list(value)
+    return [str(entry) for entry in value if entry is not None]
 
 
-def _read_array(record: Dict[str, Any], *keys: str) -> List[Dict[str, Any]]:
-    for key in keys:
-        value = record.get(key)
-        if isinstance(value, list):
-            out: List[Dict[str, Any]] = []
-            for entry in value:
-                if isinstance(entry, dict):
-                    out.append(entry)
-            return out
-    return []
+def _read_bool(record: Dict[str, Any], key: str) -> bool:
+    value = record.get(key)
+    return value if type(value) is bool else False
 
 
-def _read_object(record: Dict[str, Any], *keys: str) -> Optional[Dict[str, Any]]:
-    for key in keys:
-        value = record.get(key)
-        if isinstance(value, dict):
-            return value
-    return None
+def _read_array(record: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    value = record.get(key)
+    if type(value) is not list:
+        return []
+    return [entry for entry in value if isinstance(entry, dict)]
 
 
-def _env_value(key: str) -> str:
-    import os
+def _read_object(record: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    value = record.get(key)
+    return value if isinstance(value, dict) else None
+
 
+@functools.lru_cache(maxsize=32)
+def _env_value(key: str) -> str:
     return (os.getenv(key) or "").strip()
@@ -1,8 +1,9 @@
-import json
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from cloud.v1 import githooks_pb2
 
+from . import jsonutil
 from .event import Event
 from .metadata import (
     METADATA_KEY_EVENT,
@@ -18,6 +19,9 @@ class Codec:
     def decode(self, topic: Optional[str], msg: RelaybusMessage) -> Event:
         raise NotImplementedError
 
+    def decode_batch(self, topic: Optional[str], msg: RelaybusMessage) -> List[Event]:
+        return [self.decode(topic, msg)]
+
 
 class DefaultCodec(Codec):
     def decode(self, topic: Optional[str], msg: RelaybusMessage) -> Event:
@@ -29,41 +33,132 @@ class DefaultCodec(Codec):
         raw_payload = msg.payload
         normalized: Optional[Dict[str, Any]] = None
 
-        try:
-            env = githooks_pb2.EventPayload()
-            env.ParseFromString(msg.payload)
-            provider = env.provider
-            event_name = env.name
-            raw_payload = env.payload or b""
-            normalized = _parse_json_object(raw_payload)
-        except Exception:
-            legacy = _parse_json_value(msg.payload)
-            if isinstance(legacy, dict):
-                provider = str(legacy.get("provider", provider) or provider)
-                event_name = str(legacy.get("name", event_name) or event_name)
-                data = legacy.get("data")
-                if isinstance(data, dict):
-                    normalized = data
-            if normalized is None:
+        if _looks_like_json(msg.payload):
+            provider, event_name, normalized = _decode_legacy(msg.payload)
+        else:
+            try:
+                env = _thread_event_payload()
+                env.ParseFromString(msg.payload)
+                provider = env.provider
+                event_name = env.name
+                raw_payload = env.payload or b""
                 normalized = _parse_json_object(raw_payload)
+            except Exception:
+                provider, event_name, normalized = _decode_legacy(msg.payload)
+
+        return _build_event(topic, msg, provider, event_name, raw_payload, normalized)
 
-        metadata = dict(msg.metadata or {})
-        if not provider:
-            provider = metadata.get(METADATA_KEY_PROVIDER, "")
-        if not event_name:
-            event_name = metadata.get(METADATA_KEY_EVENT, "")
-
-        return Event(
-            provider=provider,
-            type=event_name,
-            topic=_resolve_topic(topic, msg),
-            metadata=metadata,
-            payload=raw_payload,
-            normalized=normalized,
-            request_id=metadata.get(METADATA_KEY_REQUEST_ID, ""),
-            installation_id=metadata.get(METADATA_KEY_INSTALLATION_ID, ""),
-            log_id=metadata.get(METADATA_KEY_LOG_ID, ""),
-        )
+    def decode_batch(self, topic: Optional[str], msg: RelaybusMessage) -> List[Event]:
+        if msg is None or msg.payload is None:
+            raise ValueError("message payload is required")
+        entries = _split_json_batch(msg.payload)
+        if entries is None:
+            return [self.decode(topic, msg)]
+        events: List[Event] = []
+        for raw_payload, value in entries:
+            provider, event_name, normalized = _legacy_fields(value)
+            events.append(
+                _build_event(topic, msg, provider, event_name, raw_payload, normalized)
+            )
+        return events
+
+
+def _build_event(
+    topic: Optional[str],
+    msg: RelaybusMessage,
+    provider: str,
+    event_name: str,
+    raw_payload: bytes,
+    normalized: Optional[Dict[str, Any]],
+) -> Event:
+    metadata = dict(msg.metadata or {})
+    if not provider:
+        provider = metadata.get(METADATA_KEY_PROVIDER, "")
+    if not event_name:
+        event_name = metadata.get(METADATA_KEY_EVENT, "")
+
+    return Event(
+        provider=provider,
+        type=event_name,
+        topic=_resolve_topic(topic, msg),
+        metadata=metadata,
+        payload=raw_payload,
+        normalized=normalized,
+        request_id=metadata.get(METADATA_KEY_REQUEST_ID, ""),
+        installation_id=metadata.get(METADATA_KEY_INSTALLATION_ID, ""),
+        log_id=metadata.get(METADATA_KEY_LOG_ID, ""),
+    )
+
+
+_EventPayload = githooks_pb2.EventPayload
+_local = threading.local()
+
+
+# Decoders run on several subscriber threads at once, so each thread keeps
+# its own EventPayload. ParseFromString clears it before merging.
+def _thread_event_payload() -> Any:
+    env = getattr(_local, "env", None)
+    if env is None:
+        env = _EventPayload()
+        _local.env = env
+    return env
+
+
+# EventPayload always starts with a field 1-3 tag (0x0a, 0x12 or 0x1a), so a
+# leading brace, bracket or non-newline whitespace can only be JSON.
+_JSON_LEADING_BYTES = frozenset(b"{[ \t\r")
+
+
+def _looks_like_json(data: bytes) -> bool:
+    return bool(data) and data[0] in _JSON_LEADING_BYTES
+
+
+def _decode_legacy(data: bytes) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    return _legacy_fields(_parse_json_value(data))
+
+
+def _legacy_fields(value: Any) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    if not isinstance(value, dict):
+        return "", "", None
+    provider = str(value.get("provider", "") or "")
+    event_name = str(value.get("name", "") or "")
+    data = value.get("data")
+    if isinstance(data, dict):
+        return provider, event_name, data
+    return provider, event_name, value
+
+
+# Returns None for a single event (protobuf or one JSON document) so the
+# caller falls back to decode().
+def _split_json_batch(data: bytes) -> Optional[List[Tuple[bytes, Any]]]:
+    if not _looks_like_json(data):
+        return None
+    stripped = data.strip()
+    if stripped[:1] == b"[":
+        try:
+            values = jsonutil.loads(stripped)
+        except Exception:
+            return None
+        if not isinstance(values, list):
+            return None
+        return [(jsonutil.dumps(value), value) for value in values]
+    if b"\n" not in stripped:
+        return None
+    try:
+        jsonutil.loads(stripped)
+        return None
+    except Exception:
+        pass
+    entries: List[Tuple[bytes, Any]] = []
+    for line in stripped.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append((line, jsonutil.loads(line)))
+        except Exception:
+            return None
+    return entries
 
 
 def _resolve_topic(topic: Optional[str], msg: RelaybusMessage) -> str:
@@ -84,6 +179,6 @@ def _parse_json_value(data: bytes) -> Optional[Any]:
     if not data:
         return None
     try:
-        return json.loads(data.decode("utf-8"))
+        return jsonutil.loads(data)
     except Exception:
         return None
@@ -0,0 +1,5 @@
+import sys
+from typing import Any, Dict
+
+# dataclass(slots=True) is only available from Python 3.10.
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -2,8 +2,10 @@ from dataclasses import dataclass
 from threading import Event as ThreadEvent
 from typing import Optional
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class WorkerContext:
     tenant_id: str = ""
     signal: Optional[ThreadEvent] = None
@@ -1,10 +1,13 @@
-import json
+import functools
+import hashlib
+import threading
 import time
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from . import jsonutil
 from .context import WorkerContext
 
 
@@ -25,21 +28,85 @@ class OAuth2Config:
     token_url: str = ""
     jwks_url: str = ""
 
+    def __post_init__(self) -> None:
+        # Trimmed once here; the token path uses these fields as-is, so assign
+        # already-trimmed values if the config is mutated later.
+        self.token_url = (self.token_url or "").strip()
+        self.client_id = (self.client_id or "").strip()
+        self.client_secret = (self.client_secret or "").strip()
+        self.audience = (self.audience or "").strip()
+
+
+TOKEN_EXPIRY_SKEW_SECONDS = 30
+
 
 class _TokenCache:
     def __init__(self) -> None:
-        self.token = ""
-        self.expires_at = 0.0
-        self.key = ""
+        self.lock = threading.Lock()
+        self.tokens: Dict[bytes, Tuple[str, float]] = {}
+        self.key_locks: Dict[bytes, threading.Lock] = {}
+
+    def get(self, key: bytes) -> str:
+        # Lock-free hit path: a single dict read of an immutable tuple.
+        entry = self.tokens.get(key)
+        if entry and entry[1] > time.monotonic() + TOKEN_EXPIRY_SKEW_SECONDS:
+            return entry[0]
+        return ""
+
+    def key_lock(self, key: bytes) -> threading.Lock:
+        with self.lock:
+            lock = self.key_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self.key_locks[key] = lock
+            return lock
+
+    def set(self, key: bytes, token: str, expires_at: float) -> None:
+        with self.lock:
+            now = time.monotonic()
+            for stale in [k for k, e in self.tokens.items() if e[1] <= now]:
+                del self.tokens[stale]
+                lock = self.key_locks.get(stale)
+                if lock is not None and not lock.locked():
+                    del self.key_locks[stale]
+            self.tokens[key] = (token, expires_at)
 
 
 _token_cache = _TokenCache()
 
+_default_lock = threading.Lock()
+_default_config: Optional[OAuth2Config] = None
+_default_loaded = False
+
 
 def resolve_oauth2_config(explicit: Optional[OAuth2Config]) -> Optional[OAuth2Config]:
     if explicit is not None:
         _normalize_oauth2_mode(explicit.mode)
         return explicit
+    return _default_oauth2_config()
+
+
+def _default_oauth2_config() -> Optional[OAuth2Config]:
+    global _default_config, _default_loaded
+    if _default_loaded:
+        return _default_config
+    with _default_lock:
+        if not _default_loaded:
+            _default_config = _oauth2_config_from_env()
+            _default_loaded = True
+        return _default_config
+
+
+# Drops the RELAYMESH_OAUTH2_* config cached by resolve_oauth2_config(None) so
+# the next call reads the environment again.
+def reload_default_oauth2_config() -> None:
+    global _default_config, _default_loaded
+    with _default_lock:
+        _default_config = None
+        _default_loaded = False
+
+
+def _oauth2_config_from_env() -> Optional[OAuth2Config]:
     token_url = _env_value("RELAYMESH_OAUTH2_TOKEN_URL")
     if not token_url:
         return None
@@ -60,55 +127,71 @@ def oauth2_token_from_config(
     if cfg is None or cfg.enabled is False:
         return ""
     _normalize_oauth2_mode(cfg.mode)
-    token_url = (cfg.token_url or "").strip()
-    client_id = (cfg.client_id or "").strip()
-    client_secret = (cfg.client_secret or "").strip()
+    token_url = cfg.token_url
+    client_id = cfg.client_id
+    client_secret = cfg.client_secret
     if not token_url or not client_id or not client_secret:
         return ""
-    cache_key = _build_cache_key(cfg)
-    now = time.time()
-    if (
-        _token_cache.token
-        and _token_cache.key == cache_key
-        and _token_cache.expires_at > now + 30
-    ):
-        return _token_cache.token
-
-    body = {
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "client_secret": client_secret,
-    }
-    if cfg.scopes:
-        body["scope"] = " ".join(cfg.scopes)
-    if cfg.audience:
-        body["audience"] = cfg.audience
-
-    data = urllib.parse.urlencode(body).encode("utf-8")
+    cache_key = _build_cache_key(
+        token_url, client_id, tuple(cfg.scopes or ()), cfg.audience or ""
+    )
+    token = _token_cache.get(cache_key)
+    if token:
+        return token
+
+    # Only one thread per config fetches; the rest wait and reuse its token.
+    with _token_cache.key_lock(cache_key):
+        token = _token_cache.get(cache_key)
+        if token:
+            return token
+        now = time.monotonic()
+        token, expires_in = _fetch_token(cfg, token_url, client_id, client_secret)
+        if not token:
+            return ""
+        _token_cache.set(cache_key, token, now + expires_in)
+        return token
+
+
+def _fetch_token(
+    cfg: OAuth2Config, token_url: str, client_id: str, client_secret: str
+) -> Tuple[str, int]:
+    data = _encode_token_body(client_id, client_secret, cfg.scopes, cfg.audience)
     req = urllib.request.Request(token_url, data=data, method="POST")
     req.add_header("Content-Type", "application/x-www-form-urlencoded")
     with urllib.request.urlopen(req, timeout=10) as resp:
-        payload = json.loads(resp.read().decode("utf-8"))
+        payload = jsonutil.loads(resp.read())
     token = str(payload.get("access_token", "")).strip()
     if not token:
-        return ""
-    expires_in = int(payload.get("expires_in", 1800))
-    _token_cache.token = token
-    _token_cache.key = cache_key
-    _token_cache.expires_at = now + expires_in
-    return token
-
-
-def _build_cache_key(cfg: OAuth2Config) -> str:
-    scopes = " ".join(cfg.scopes or [])
-    return "|".join(
-        [
-            (cfg.token_url or "").strip(),
-            (cfg.client_id or "").strip(),
-            scopes,
-            (cfg.audience or "").strip(),
-        ]
-    )
+        return "", 0
+    return token, int(payload.get("expires_in", 1800))
+
+
+def _encode_token_body(
+    client_id: str, client_secret: str, scopes: Optional[List[str]], audience: str
+) -> bytes:
+    # Same output as urlencode() of the form dict, without building the dict.
+    parts = [
+        b"grant_type=client_credentials",
+        b"client_id=" + urllib.parse.quote_plus(client_id).encode("ascii"),
+        b"client_secret=" + urllib.parse.quote_plus(client_secret).encode("ascii"),
+    ]
+    if scopes:
+        parts.append(
+            b"scope=" + urllib.parse.quote_plus(" ".join(scopes)).encode("ascii")
+        )
+    if audience:
+        parts.append(b"audience=" + urllib.parse.quote_plus(audience).encode("ascii"))
+    return b"&".join(parts)
+
+
+# Tokens are keyed by a digest so the token cache does not hold readable
+# client identifiers for the life of the process.
+@functools.lru_cache(maxsize=64)
+def _build_cache_key(
+    token_url: str, client_id: str, scopes: Tuple[str, ...], audience: str
+) -> bytes:
+    raw = "|".join([token_url, client_id, " ".join(scopes), audience])
+    return hashlib.sha256(raw.encode("utf-8")).digest()
 
 
 def _env_value(key: str) -> str:
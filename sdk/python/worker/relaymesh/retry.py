@@ -1,11 +1,12 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from .compat import DATACLASS_SLOTS
 from .context import WorkerContext
 from .event import Event
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RetryDecision:
     retry: bool = False
     nack: bool = True
@@ -1,10 +1,13 @@
 import datetime
 import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from .api import APIClientOptions, SCMClientsClient, resolve_endpoint
 from .client import ClientProvider
+from .compat import DATACLASS_SLOTS
 from .metadata import METADATA_KEY_INSTALLATION_ID, METADATA_KEY_PROVIDER_INSTANCE_KEY
 from .oauth2 import OAuth2Config, resolve_oauth2_config
 from .scm_clients import (
@@ -18,7 +21,7 @@ DEFAULT_SCM_CACHE_SIZE = 10
 DEFAULT_SCM_CACHE_SKEW_SECONDS = 30
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RemoteSCMClientProviderOptions:
     endpoint: str = ""
     api_key: str = ""
@@ -27,12 +30,16 @@ class RemoteSCMClientProviderOptions:
     cache_skew_seconds: int = DEFAULT_SCM_CACHE_SKEW_SECONDS
     timeout: float = 10.0
 
+    def __post_init__(self) -> None:
+        self.endpoint = (self.endpoint or "").strip()
+        self.api_key = (self.api_key or "").strip()
+
 
 class RemoteSCMClientProvider(ClientProvider):
     def __init__(self, opts: Optional[RemoteSCMClientProviderOptions] = None) -> None:
         options = opts or RemoteSCMClientProviderOptions()
         self.endpoint = resolve_endpoint(options.endpoint)
-        self.api_key = (options.api_key or "").strip()
+        self.api_key = options.api_key
         self.oauth2_config = resolve_oauth2_config(options.oauth2_config)
         self.cache = _SCMClientCache(max(1, options.cache_size))
         self.cache_skew_seconds = max(0, int(options.cache_skew_seconds))
@@ -119,7 +126,7 @@ def BitbucketClient(evt: object):
     return BitbucketClientFromEvent(evt)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class _SCMClientResult:
     client: Optional[object]
     expires_at: Optional[datetime.datetime]
@@ -129,8 +136,7 @@ class _SCMClientCache:
     def __init__(self, size: int) -> None:
         self.size = max(1, size)
         self.lock = threading.Lock()
-        self.items: "dict[str, _SCMCacheEntry]" = {}
-        self.order: "list[str]" = []
+        self.items: "OrderedDict[str, _SCMCacheEntry]" = OrderedDict()
 
     def get(self, key: str, skew_seconds: int) -> Optional[object]:
         if not key:
@@ -139,10 +145,10 @@ class _SCMClientCache:
             entry = self.items.get(key)
             if entry is None:
                 return None
-            if _expired(entry.expires_at, skew_seconds):
-                self._delete(key)
+            if _expired(entry.deadline, skew_seconds):
+                del self.items[key]
                 return None
-            self._bump(key)
+            self.items.move_to_end(key)
             return entry.client
 
     def add(
@@ -151,36 +157,28 @@ class _SCMClientCache:
         if not key or client is None:
             return
         with self.lock:
-            if key in self.items:
-                self.items[key] = _SCMCacheEntry(client=client, expires_at=expires_at)
-                self._bump(key)
-                return
-            self.items[key] = _SCMCacheEntry(client=client, expires_at=expires_at)
-            self.order.insert(0, key)
-            while len(self.order) > self.size:
-                old_key = self.order.pop()
-                self.items.pop(old_key, None)
-
-    def _bump(self, key: str) -> None:
-        if key in self.order:
-            self.order.remove(key)
-        self.order.insert(0, key)
-
-    def _delete(self, key: str) -> None:
-        self.items.pop(key, None)
-        if key in self.order:
-            self.order.remove(key)
-
-
-@dataclass
-class _SCMCacheEntry:
+            self.items[key] = _SCMCacheEntry(
+                client=client, deadline=_monotonic_deadline(expires_at)
+            )
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+
+class _SCMCacheEntry(NamedTuple):
     client: object
-    expires_at: Optional[datetime.datetime]
+    # time.monotonic() value at which the token expires; None never expires.
+    deadline: Optional[float]
 
 
-def _expired(expires_at: Optional[datetime.datetime], skew_seconds: int) -> bool:
+def _monotonic_deadline(expires_at: Optional[datetime.datetime]) -> Optional[float]:
     if expires_at is None:
-        return False
+        return None
     now = datetime.datetime.now(tz=datetime.timezone.utc)
-    skew = datetime.timedelta(seconds=max(0, skew_seconds))
-    return now >= (expires_at - skew)
+    return time.monotonic() + (expires_at - now).total_seconds()
+
+
+def _expired(deadline: Optional[float], skew_seconds: int) -> bool:
+    if deadline is None:
+        return False
+    return time.monotonic() >= deadline - max(0, skew_seconds)
@@ -1,11 +1,17 @@
-import json
-import urllib.error
-import urllib.request
 from dataclasses import dataclass
-from typing import Dict, Optional, Protocol
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Protocol
 
+from . import jsonutil
+from .compat import DATACLASS_SLOTS
+from .transport import new_session
 
-@dataclass
+# One keep-alive pool shared by every SCM client; clients for different
+# installations still talk to the same handful of provider hosts.
+_SESSION = new_session(pool_connections=16, pool_maxsize=64)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class HTTPResponse:
     status: int
     headers: Dict[str, str]
@@ -17,7 +23,7 @@ class HTTPResponse:
     def json(self) -> object:
         if not self.body:
             return {}
-        return json.loads(self.body.decode("utf-8"))
+        return jsonutil.loads(self.body)
 
 
 class SCMClient(Protocol):
@@ -42,6 +48,14 @@ class GitHubClient:
     def __init__(self, token: str, base_url: str) -> None:
         self.token = token
         self.base_url = base_url
+        self._url_base = (base_url or "").rstrip("/")
+        self._base_headers: Mapping[str, str] = MappingProxyType(
+            {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "Content-Type": "application/json",
+            }
+        )
 
     def request(
         self,
@@ -50,14 +64,9 @@ class GitHubClient:
         body: Optional[object] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> HTTPResponse:
-        merged = {
-            "Authorization": f"Bearer {self.token}",
-            "Accept": "application/vnd.github+json",
-            "Content-Type": "application/json",
-        }
-        if headers:
-            merged.update(headers)
-        return _request(self.base_url, method, path, body, merged)
+        merged = {**self._base_headers, **headers} if headers else self._base_headers
+        url = _resolve_url(self.base_url, self._url_base, path)
+        return _request(method, url, body, merged)
 
     def request_json(
         self,
@@ -76,6 +85,13 @@ class GitLabClient:
     def __init__(self, token: str, base_url: str) -> None:
         self.token = token
         self.base_url = base_url
+        self._url_base = (base_url or "").rstrip("/")
+        self._base_headers: Mapping[str, str] = MappingProxyType(
+            {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+        )
 
     def request(
         self,
@@ -84,13 +100,9 @@ class GitLabClient:
         body: Optional[object] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> HTTPResponse:
-        merged = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        if headers:
-            merged.update(headers)
-        return _request(self.base_url, method, path, body, merged)
+        merged = {**self._base_headers, **headers} if headers else self._base_headers
+        url = _resolve_url(self.base_url, self._url_base, path)
+        return _request(method, url, body, merged)
 
     def request_json(
         self,
@@ -109,6 +121,13 @@ class BitbucketClient:
     def __init__(self, token: str, base_url: str) -> None:
         self.token = token
         self.base_url = base_url
+        self._url_base = (base_url or "").rstrip("/")
+        self._base_headers: Mapping[str, str] = MappingProxyType(
+            {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+        )
 
     def request(
         self,
@@ -117,13 +136,9 @@ class BitbucketClient:
         body: Optional[object] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> HTTPResponse:
-        merged = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        if headers:
-            merged.update(headers)
-        return _request(self.base_url, method, path, body, merged)
+        merged = {**self._base_headers, **headers} if headers else self._base_headers
+        url = _resolve_url(self.base_url, self._url_base, path)
+        return _request(method, url, body, merged)
 
     def request_json(
         self,
@@ -161,8 +176,13 @@ def BitbucketClientFromEvent(evt: object) -> Optional[BitbucketClient]:
     return None
 
 
+_KNOWN_PROVIDERS = frozenset(("github", "gitlab", "bitbucket"))
+
+
 def new_provider_client(provider: str, token: str, base_url: str) -> SCMClient:
-    normalized = (provider or "").strip().lower()
+    normalized = (
+        provider if provider in _KNOWN_PROVIDERS else (provider or "").strip().lower()
+    )
     if normalized == "github":
         return GitHubClient(token, _resolve_api_base(base_url, normalized))
     if normalized == "gitlab":
@@ -189,34 +209,27 @@ def _resolve_api_base(base_url: str, provider: str) -> str:
     return trimmed
 
 
-def _resolve_url(base_url: str, path: str) -> str:
+def _resolve_url(base_url: str, url_base: str, path: str) -> str:
+    # url_base is base_url with trailing slashes removed, computed per client.
     if not path:
         return base_url
-    if path.startswith("http://") or path.startswith("https://"):
+    if path[0] == "/":
+        return url_base + path
+    if path.startswith(("http://", "https://")):
         return path
-    normalized_base = (base_url or "").rstrip("/")
-    normalized_path = path if path.startswith("/") else f"/{path}"
-    return f"{normalized_base}{normalized_path}"
+    return f"{url_base}/{path}"
 
 
 def _request(
-    base_url: str,
     method: str,
-    path: str,
+    url: str,
     body: Optional[object],
-    headers: Dict[str, str],
+    headers: Mapping[str, str],
 ) -> HTTPResponse:
-    url = _resolve_url(base_url, path)
-    data = json.dumps(body).encode("utf-8") if body is not None else None
-    req = urllib.request.Request(url, data=data, method=(method or "GET").upper())
-    for key, value in headers.items():
-        req.add_header(key, value)
-    try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            payload = resp.read()
-            return HTTPResponse(
-                status=resp.status, headers=dict(resp.headers), body=payload
-            )
-    except urllib.error.HTTPError as err:
-        raw = err.read() if err.fp else b""
-        return HTTPResponse(status=err.code, headers=dict(err.headers or {}), body=raw)
+    data = jsonutil.dumps(body) if body is not None else None
+    resp = _SESSION.request(
+        (method or "GET").upper(), url, data=data, headers=headers, timeout=10
+    )
+    return HTTPResponse(
+        status=resp.status_code, headers=dict(resp.headers), body=resp.content
+    )
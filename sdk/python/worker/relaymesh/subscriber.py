@@ -1,14 +1,22 @@
-import json
 import threading
+import time
 from dataclasses import asdict
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
+from . import jsonutil
 from .config import AmqpConfig, KafkaConfig, NatsConfig, SubscriberConfig
 from .metadata import METADATA_KEY_DRIVER
 from .types import RelaybusMessage, coerce_message
 
 MessageHandler = Callable[[RelaybusMessage], Optional[bool]]
 
+_RECONNECT_INITIAL_DELAY = 0.1
+_RECONNECT_MAX_DELAY = 5.0
+# A TimeoutError raised at least this long after start() is an ordinary idle
+# poll (the adapters default to a 30s window); a faster one is a failure to
+# reach the broker and is backed off.
+_MIN_IDLE_POLL_SECONDS = 1.0
+
 
 class Subscriber:
     def start(self, topic: str, handler: MessageHandler) -> None:
@@ -19,7 +27,7 @@ class Subscriber:
 
 
 def subscriber_config_from_driver(driver: str, raw: str) -> SubscriberConfig:
-    driver = (driver or "").strip().lower()
+    driver = _driver_name(driver)
     if not driver:
         raise ValueError("driver is required")
     cfg = SubscriberConfig(driver=driver)
@@ -33,20 +41,14 @@ def apply_driver_config(cfg: SubscriberConfig, name: str, raw: str) -> None:
     payload = (raw or "").strip()
     if not payload:
         return
-    data = json.loads(payload)
+    data = jsonutil.loads(payload)
     if not isinstance(data, dict):
         return
-    name = (name or "").strip().lower()
-    if name == "amqp":
-        apply_amqp_config(cfg.amqp, data)
-        return
-    if name == "nats":
-        apply_nats_config(cfg.nats, data)
-        return
-    if name == "kafka":
-        apply_kafka_config(cfg.kafka, data)
-        return
-    raise ValueError(f"unsupported driver: {name}")
+    name = _driver_name(name)
+    apply = _DRIVER_APPLIERS.get(name)
+    if apply is None:
+        raise ValueError(f"unsupported driver: {name}")
+    apply(cfg, data)
 
 
 def apply_amqp_config(cfg: AmqpConfig, data: Dict[str, object]) -> None:
@@ -78,11 +80,26 @@ def apply_kafka_config(cfg: KafkaConfig, data: Dict[str, object]) -> None:
     cfg.max_messages = read_int(data, "max_messages", "maxMessages")
 
 
+_KNOWN_DRIVERS = frozenset(("amqp", "nats", "kafka"))
+
+
+# Driver names almost always arrive already canonical; skip the strip/lower
+# copies for the known ones.
+def _driver_name(value: Optional[str]) -> str:
+    if value in _KNOWN_DRIVERS:
+        return value
+    return (value or "").strip().lower()
+
+
+_DRIVER_APPLIERS: Dict[str, Callable[[SubscriberConfig, Dict[str, object]], None]] = {
+    "amqp": lambda cfg, data: apply_amqp_config(cfg.amqp, data),
+    "nats": lambda cfg, data: apply_nats_config(cfg.nats, data),
+    "kafka": lambda cfg, data: apply_kafka_config(cfg.kafka, data),
+}
+
+
 def build_subscriber(cfg: SubscriberConfig) -> Subscriber:
-    drivers = unique_strings(cfg.drivers)
-    if cfg.driver:
-        drivers.append(cfg.driver)
-        drivers = unique_strings(drivers)
+    drivers = unique_strings([*cfg.drivers, cfg.driver])
     if not drivers:
         raise ValueError("at least one driver is required")
     if len(drivers) == 1:
@@ -101,13 +118,19 @@ def new_from_config(cfg: SubscriberConfig, *opts) -> "Worker":
 
 class _RelaybusSubscriber(Subscriber):
     def __init__(self, cfg: SubscriberConfig, driver: str) -> None:
-        self.driver = (driver or "").strip().lower()
+        self.driver = _driver_name(driver)
+        self._driver_metadata: Optional[Dict[str, str]] = (
+            {METADATA_KEY_DRIVER: self.driver} if self.driver else None
+        )
         self.cfg = cfg
         self._inner = None
+        self._closed = threading.Event()
 
     def start(self, topic: str, handler: MessageHandler) -> None:
         if not handler:
             raise ValueError("handler is required")
+        # A subscriber closed earlier can be started again.
+        self._closed.clear()
         if self.driver == "amqp":
             self._start_amqp(topic, handler)
             return
@@ -120,21 +143,45 @@ class _RelaybusSubscriber(Subscriber):
         raise ValueError(f"unsupported subscriber driver: {self.driver}")
 
     def close(self) -> None:
+        self._closed.set()
         if self._inner is not None:
             try:
                 self._inner.close()
             except Exception:
                 return None
 
+    def _consume(self, topic: str) -> None:
+        # Adapters raise TimeoutError after an idle poll window; one that comes
+        # back sooner than that means the broker is unreachable, so back off
+        # instead of reconnecting in a tight loop. Any other error ends this
+        # topic's consumption, as before.
+        inner = self._inner
+        if inner is None:
+            return
+        delay = _RECONNECT_INITIAL_DELAY
+        while not self._closed.is_set():
+            started = time.monotonic()
+            try:
+                inner.start(topic)
+            except TimeoutError:
+                if time.monotonic() - started >= _MIN_IDLE_POLL_SECONDS:
+                    delay = _RECONNECT_INITIAL_DELAY
+                    continue
+                if self._closed.wait(delay):
+                    break
+                delay = min(delay * 2, _RECONNECT_MAX_DELAY)
+                continue
+            except Exception:
+                break
+            delay = _RECONNECT_INITIAL_DELAY
+
     def _start_amqp(self, topic: str, handler: MessageHandler) -> None:
         if not self.cfg.amqp.url:
             raise ValueError("amqp url is required")
         from relaybus_amqp import AmqpSubscriber, AmqpSubscriberConnectConfig
 
         def on_message(msg: object) -> None:
-            relay_msg = coerce_message(msg)
-            if self.driver and METADATA_KEY_DRIVER not in relay_msg.metadata:
-                relay_msg.metadata[METADATA_KEY_DRIVER] = self.driver
+            relay_msg = coerce_message(msg, self._driver_metadata)
             result = handler(relay_msg)
             if result:
                 raise RuntimeError("message nack requested")
@@ -148,13 +195,7 @@ class _RelaybusSubscriber(Subscriber):
                 on_message=on_message,
             )
         )
-        while True:
-            try:
-                self._inner.start(topic)
-            except TimeoutError:
-                continue
-            except Exception:
-                break
+        self._consume(topic)
 
     def _start_nats(self, topic: str, handler: MessageHandler) -> None:
         if not self.cfg.nats.url:
@@ -162,9 +203,7 @@ class _RelaybusSubscriber(Subscriber):
         from relaybus_nats import NatsSubscriber, NatsSubscriberConnectConfig
 
         def on_message(msg: object) -> None:
-            relay_msg = coerce_message(msg)
-            if self.driver and METADATA_KEY_DRIVER not in relay_msg.metadata:
-                relay_msg.metadata[METADATA_KEY_DRIVER] = self.driver
+            relay_msg = coerce_message(msg, self._driver_metadata)
             handler(relay_msg)
 
         self._inner = NatsSubscriber.connect(
@@ -174,13 +213,7 @@ class _RelaybusSubscriber(Subscriber):
                 on_message=on_message,
             )
         )
-        while True:
-            try:
-                self._inner.start(topic)
-            except TimeoutError:
-                continue
-            except Exception:
-                break
+        self._consume(topic)
 
     def _start_kafka(self, topic: str, handler: MessageHandler) -> None:
         from relaybus_kafka import KafkaSubscriber, KafkaSubscriberConnectConfig
@@ -192,9 +225,7 @@ class _RelaybusSubscriber(Subscriber):
             raise ValueError("kafka brokers are required")
 
         def on_message(msg: object) -> None:
-            relay_msg = coerce_message(msg)
-            if self.driver and METADATA_KEY_DRIVER not in relay_msg.metadata:
-                relay_msg.metadata[METADATA_KEY_DRIVER] = self.driver
+            relay_msg = coerce_message(msg, self._driver_metadata)
             handler(relay_msg)
 
         self._inner = KafkaSubscriber.connect(
@@ -208,13 +239,7 @@ class _RelaybusSubscriber(Subscriber):
         kafka_topic = topic
         if self.cfg.kafka.topic_prefix:
             kafka_topic = f"{self.cfg.kafka.topic_prefix}{topic}"
-        while True:
-            try:
-                self._inner.start(kafka_topic)
-            except TimeoutError:
-                continue
-            except Exception:
-                break
+        self._consume(kafka_topic)
 
 
 class _MultiSubscriber(Subscriber):
@@ -230,7 +255,12 @@ class _MultiSubscriber(Subscriber):
 
         self.threads = []
         for sub in self.subs:
-            t = threading.Thread(target=sub.start, args=(topic, handler), daemon=True)
+            t = threading.Thread(
+                target=sub.start,
+                args=(topic, handler),
+                name=f"multi-sub-{sub.driver}",
+                daemon=True,
+            )
             t.start()
             self.threads.append(t)
 
@@ -243,46 +273,43 @@ class _MultiSubscriber(Subscriber):
 
 
 def unique_strings(values: List[str]) -> List[str]:
-    seen = set()
-    out: List[str] = []
-    for value in values:
-        normalized = (value or "").strip().lower()
-        if not normalized or normalized in seen:
-            continue
-        seen.add(normalized)
-        out.append(normalized)
-    return out
+    normalized = (_driver_name(value) for value in values)
+    return list(dict.fromkeys(value for value in normalized if value))
 
 
-def read_string(data: Dict[str, object], *keys: str) -> str:
+_T = TypeVar("_T")
+_D = TypeVar("_D")
+
+
+def _read(
+    data: Dict[str, object], keys: Tuple[str, ...], type_: Type[_T], default: _D
+) -> Union[_T, _D]:
     for key in keys:
         value = data.get(key)
-        if isinstance(value, str):
+        if isinstance(value, type_):
             return value
-    return ""
+    return default
+
+
+def read_string(data: Dict[str, object], *keys: str) -> str:
+    return _read(data, keys, str, "")
 
 
 def read_bool(data: Dict[str, object], *keys: str) -> bool:
-    for key in keys:
-        value = data.get(key)
-        if isinstance(value, bool):
-            return value
-    return False
+    return _read(data, keys, bool, False)
 
 
 def read_int(data: Dict[str, object], *keys: str) -> int:
     for key in keys:
         value = data.get(key)
-        if isinstance(value, int):
+        # bool subclasses int; `"max_messages": true` is not a count.
+        if isinstance(value, int) and not isinstance(value, bool):
             return value
     return 0
 
 
 def read_string_list(data: Dict[str, object], *keys: str) -> List[str]:
-    for key in keys:
-        value = data.get(key)
-        if isinstance(value, list):
-            return [
-                str(item) for item in value if isinstance(item, str) or item is not None
-            ]
-    return []
+    value = _read(data, keys, list, None)
+    if value is None:
+        return []
+    return [str(item) for item in value if item is not None]
@@ -0,0 +1,45 @@
+import http.cookiejar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _SharedSession(requests.Session):
+    # One session serves clients for many installations and tenants, so it
+    # must not carry state from one request to the next: cookies are never
+    # stored and ~/.netrc never replaces the Authorization header a client
+    # built. Proxy and CA bundle settings from the environment still apply.
+    def __init__(self) -> None:
+        super().__init__()
+        self.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        # A session-level auth stops prepare_request from loading netrc.
+        self.auth = _keep_headers
+
+    def rebuild_auth(
+        self, prepared_request: requests.PreparedRequest, response: requests.Response
+    ) -> None:
+        # requests' cross-host Authorization stripping, without the netrc
+        # lookup it does afterwards.
+        headers = prepared_request.headers
+        old_url = response.request.url or ""
+        if "Authorization" in headers and self.should_strip_auth(
+            old_url, prepared_request.url or ""
+        ):
+            del headers["Authorization"]
+
+
+def _keep_headers(request: requests.PreparedRequest) -> requests.PreparedRequest:
+    return request
+
+
+def new_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    session = _SharedSession()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=0),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
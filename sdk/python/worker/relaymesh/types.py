@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class RelaybusMessage:
     topic: str
     payload: bytes
@@ -10,16 +12,47 @@ class RelaybusMessage:
     content_type: str = ""
 
 
-def coerce_message(msg: object) -> RelaybusMessage:
+# Messages are taken over, not copied: a RelaybusMessage whose metadata is
+# already a plain dict and needs no defaults is returned as-is, and a
+# plain-dict metadata mapping is reused, so callers hand ownership over and
+# must not mutate the source message afterwards. The source message itself is
+# never written to. default_metadata entries are merged underneath the
+# message's own metadata.
+def coerce_message(
+    msg: object, default_metadata: Optional[Mapping[str, str]] = None
+) -> RelaybusMessage:
+    if type(msg) is RelaybusMessage:
+        # Handlers always see a plain dict; a message that already has one and
+        # gains no defaults is kept. Otherwise build a new message, so one that
+        # is redelivered or shared keeps its own metadata.
+        own = msg.metadata
+        if type(own) is dict and not default_metadata:
+            return msg
+        if type(own) is not dict:
+            own = dict(own or {})
+        if default_metadata:
+            own = {**default_metadata, **own}
+        return RelaybusMessage(
+            topic=msg.topic,
+            payload=msg.payload,
+            metadata=own,
+            content_type=msg.content_type,
+        )
     topic = getattr(msg, "topic", "") or ""
     payload = getattr(msg, "payload", b"") or b""
     metadata = getattr(msg, "metadata", None) or getattr(msg, "meta", None)
     content_type = getattr(msg, "content_type", "") or ""
+    # Normalise before merging: adapters may hand over None, another mapping
+    # type or a list of pairs, all of which dict() accepts.
     if metadata is None:
         metadata = {}
+    elif type(metadata) is not dict:
+        metadata = dict(metadata)
+    if default_metadata:
+        metadata = {**default_metadata, **metadata}
     return RelaybusMessage(
-        topic=str(topic),
+        topic=topic if type(topic) is str else str(topic),
         payload=payload,
-        metadata=dict(metadata),
-        content_type=str(content_type),
+        metadata=metadata,
+        content_type=content_type if type(content_type) is str else str(content_type),
     )
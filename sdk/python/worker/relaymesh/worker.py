@@ -1,7 +1,22 @@
+import functools
 import inspect
+import queue
+import sys
 import threading
+import weakref
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Set, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from .api import (
     APIClientOptions,
@@ -25,8 +40,12 @@ from .metadata import (
     METADATA_KEY_TENANT_ID,
 )
 from .oauth2 import OAuth2Config, resolve_oauth2_config
-from .retry import NoRetry, RetryPolicy, normalize_retry_decision
-from .subscriber import Subscriber, build_subscriber, subscriber_config_from_driver
+from .retry import NoRetry, RetryDecision, RetryPolicy, normalize_retry_decision
+from .subscriber import (
+    Subscriber,
+    build_subscriber,
+    subscriber_config_from_driver,
+)
 from .types import RelaybusMessage, coerce_message
 
 Handler = Union[Callable[[WorkerContext, Event], Any], Callable[[Event], Any]]
@@ -74,6 +93,9 @@ class WorkerOptions:
 
 WorkerOption = Callable[["Worker"], None]
 
+STATUS_QUEUE_SIZE = 10000
+STATUS_DRAIN_TIMEOUT_SECONDS = 5.0
+
 
 class Worker:
     def __init__(self, opts: Optional[WorkerOptions] = None) -> None:
@@ -103,12 +125,78 @@ class Worker:
         self.allowed_topics: Set[str] = set()
         self.driver_subs: Dict[str, Subscriber] = {}
         self.topics: List[str] = []
-        self.semaphore = threading.Semaphore(self.concurrency)
+        self.semaphore = threading.BoundedSemaphore(self.concurrency)
+        # Middleware-wrapped handlers keyed by the registered handler, so the
+        # chain is built once per handler instead of once per message.
+        self._wrapped: Dict[ContextualHandler, ContextualHandler] = {}
+        self._api: Optional[_APIClients] = None
+        self._status_lock = threading.Lock()
+        self._status_queue: "Optional[queue.Queue[Optional[_StatusUpdate]]]" = None
+        self._status_sender: Optional[threading.Thread] = None
+        # Set by close() until the next run(); later updates, e.g. from a
+        # handler still running, are sent inline instead of starting a sender
+        # nothing would join.
+        self._status_closed = False
+        # Serialises close() calls, so run() also waits for a drain the
+        # signal watcher started.
+        self._status_stop_lock = threading.Lock()
 
         if options.topics:
             self.add_topics(options.topics)
         self.bind_client_provider()
 
+    # Logger, retry policy and client provider accept both Go-style and Python
+    # method names; resolve which one to call when they are assigned rather
+    # than probing with hasattr on every message.
+    @property
+    def logger(self) -> Logger:
+        return self._logger
+
+    @logger.setter
+    def logger(self, logger: Logger) -> None:
+        self._logger = logger
+        self._log_fn = _resolve_printf(logger)
+
+    @property
+    def retry(self) -> RetryPolicy:
+        return self._retry
+
+    @retry.setter
+    def retry(self, policy: RetryPolicy) -> None:
+        self._retry = policy
+        self._retry_fn = getattr(policy, "OnError", None) or policy.on_error
+
+    @property
+    def client_provider(self) -> Optional[ClientProvider]:
+        return self._client_provider
+
+    @client_provider.setter
+    def client_provider(self, provider: Optional[ClientProvider]) -> None:
+        self._client_provider = provider
+        self._client_fn = (
+            None if provider is None else _resolve_client_provider(provider)
+        )
+
+    @property
+    def listeners(self) -> List[Listener]:
+        return self._listeners
+
+    @listeners.setter
+    def listeners(self, listeners: List[Listener]) -> None:
+        # Hooks are bound once per assignment; reassign the list rather than
+        # mutating it in place to add or remove listeners.
+        self._listeners = listeners
+        self._on_start = tuple(lsn.OnStart for lsn in listeners)
+        self._on_exit = tuple(lsn.OnExit for lsn in listeners)
+        self._on_message_start = tuple(lsn.OnMessageStart for lsn in listeners)
+        self._on_message_finish = tuple(lsn.OnMessageFinish for lsn in listeners)
+        self._on_error = tuple(lsn.OnError for lsn in listeners)
+
+    def _retry_decision(
+        self, ctx: WorkerContext, evt: Optional[Event], err: Exception
+    ) -> RetryDecision:
+        return normalize_retry_decision(self._retry_fn(ctx, evt, err))
+
     @classmethod
     def new(cls, *options: WorkerOption) -> "Worker":
         wk = cls()
@@ -125,9 +213,10 @@ class Worker:
             self.logger = options.logger
         if options.concurrency is not None:
             self.concurrency = max(1, int(options.concurrency))
-            self.semaphore = threading.Semaphore(self.concurrency)
+            self.semaphore = threading.BoundedSemaphore(self.concurrency)
         if options.middleware is not None:
             self.middleware = list(options.middleware)
+            self._wrapped = {}
         if options.retry is not None:
             self.retry = options.retry
         if options.retry_count is not None:
@@ -163,7 +252,7 @@ class Worker:
 
     def add_topics(self, topics: Sequence[str]) -> None:
         for topic in topics:
-            trimmed = (topic or "").strip()
+            trimmed = sys.intern((topic or "").strip())
             if not trimmed:
                 continue
             self.topics.append(trimmed)
@@ -175,11 +264,11 @@ class Worker:
         driver_or_handler: Union[str, Handler],
         handler: Optional[Handler] = None,
     ) -> None:
-        trimmed = (topic or "").strip()
+        trimmed = sys.intern((topic or "").strip())
         if not trimmed:
             return
         if self.allowed_topics and trimmed not in self.allowed_topics:
-            _log_printf(self.logger, "handler topic not subscribed: %s", trimmed)
+            self._log_fn("handler topic not subscribed: %s", trimmed)
             return
 
         driver_id = ""
@@ -194,7 +283,7 @@ class Worker:
         if not driver_id:
             driver_id = self.default_driver_id
         if not driver_id and self.subscriber is None:
-            _log_printf(self.logger, "driver id required for topic: %s", trimmed)
+            self._log_fn("driver id required for topic: %s", trimmed)
             return
 
         self.topic_handlers[trimmed] = _to_context_handler(resolved_handler)
@@ -211,7 +300,7 @@ class Worker:
         self.handle_topic(topic, driver_or_handler, handler)
 
     def handle_type(self, event_type: str, handler: Handler) -> None:
-        trimmed = (event_type or "").strip()
+        trimmed = sys.intern((event_type or "").strip())
         if not trimmed or handler is None:
             return
         self.type_handlers[trimmed] = _to_context_handler(handler)
@@ -230,7 +319,18 @@ class Worker:
 
     def run(self, ctx: Optional[Union[WorkerContext, threading.Event]] = None) -> None:
         base_ctx = self.resolve_context(ctx)
+        with self._status_lock:
+            self._status_closed = False
+        # The signal watcher is a daemon thread; drain queued status updates
+        # here so none are lost when the caller exits after run() returns.
+        try:
+            self._run(base_ctx)
+        finally:
+            self._stop_status_updates()
+
+    def _run(self, base_ctx: WorkerContext) -> None:
         self.prepare_rule_subscriptions(base_ctx)
+        self._wrapped = {}
         if not self.topics:
             raise ValueError("at least one topic is required")
 
@@ -250,6 +350,12 @@ class Worker:
         self.run(ctx)
 
     def close(self) -> None:
+        try:
+            self._close_subscribers()
+        finally:
+            self._stop_status_updates()
+
+    def _close_subscribers(self) -> None:
         if self.subscriber is None:
             for sub in list(self.driver_subs.values()):
                 if sub is None:
@@ -308,9 +414,7 @@ class Worker:
                     )
                 for topic in _unique(topics):
                     tasks.append(
-                        lambda sub=sub, topic=topic: self._run_topic_subscriber(
-                            ctx, sub, topic
-                        )
+                        functools.partial(self._run_topic_subscriber, ctx, sub, topic)
                     )
             self._run_tasks(ctx, tasks)
         finally:
@@ -320,21 +424,21 @@ class Worker:
         self, ctx: WorkerContext, sub: Subscriber, topics: List[str]
     ) -> None:
         tasks = [
-            lambda sub=sub, topic=topic: self._run_topic_subscriber(ctx, sub, topic)
+            functools.partial(self._run_topic_subscriber, ctx, sub, topic)
             for topic in topics
         ]
         self._run_tasks(ctx, tasks)
 
-    def _run_tasks(self, ctx: WorkerContext, tasks: List[Callable[[], None]]) -> None:
-        errors: List[Exception] = []
-        lock = threading.Lock()
+    def _run_tasks(
+        self, ctx: WorkerContext, tasks: Sequence[Callable[[], None]]
+    ) -> None:
+        errors: "queue.SimpleQueue[Exception]" = queue.SimpleQueue()
 
         def wrap(task: Callable[[], None]) -> None:
             try:
                 task()
             except Exception as exc:
-                with lock:
-                    errors.append(exc)
+                errors.put(exc)
                 if ctx.signal is not None:
                     ctx.signal.set()
 
@@ -353,8 +457,8 @@ class Worker:
         for t in threads:
             t.join()
 
-        if errors:
-            raise errors[0]
+        if not errors.empty():
+            raise errors.get()
 
     def _wait_for_signal(self, signal: threading.Event) -> None:
         signal.wait()
@@ -363,9 +467,15 @@ class Worker:
     def _run_topic_subscriber(
         self, ctx: WorkerContext, sub: Subscriber, topic: str
     ) -> None:
+        # Registered topics are interned, so this makes the per-message handler
+        # lookup an identity match.
+        topic = sys.intern(topic)
+
         def handler(msg: RelaybusMessage) -> Optional[bool]:
             with self.semaphore:
-                relay_msg = coerce_message(msg)
+                # Relaybus subscribers already deliver RelaybusMessage; skip the
+                # call.
+                relay_msg = msg if type(msg) is RelaybusMessage else coerce_message(msg)
                 should_nack = self.handle_message(ctx, topic, relay_msg)
                 if should_nack and _should_requeue(relay_msg):
                     return True
@@ -390,10 +500,11 @@ class Worker:
     def build_driver_subscribers(
         self, ctx: WorkerContext, driver_topics: Dict[str, List[str]]
     ) -> None:
+        client = self.drivers_client()
         for driver_id in driver_topics:
             if driver_id in self.driver_subs:
                 continue
-            record = self.drivers_client().get_driver_by_id(driver_id, ctx)
+            record = client.get_driver_by_id(driver_id, ctx)
             if record is None:
                 raise ValueError(f"driver not found: {driver_id}")
             if not record.enabled:
@@ -410,31 +521,28 @@ class Worker:
         try:
             evt = self.codec.decode(topic, msg)
         except Exception as err:
-            _log_printf(self.logger, "decode failed: %s", err)
+            self._log_fn("decode failed: %s", err)
             self.update_event_log_status(ctx, log_id, EVENT_LOG_STATUS_FAILED, err)
             self.notify_error(ctx, None, err)
-            decision = _call_retry_policy(self.retry, ctx, None, err)
+            decision = self._retry_decision(ctx, None, err)
             return decision.retry or decision.nack
 
-        event_ctx = self.build_context(ctx, topic, msg)
-        if self.client_provider is not None:
+        event_ctx = self.build_context(ctx, topic, msg, metadata)
+        if self._client_fn is not None:
             try:
-                evt.client = _resolve_client_provider(self.client_provider)(
-                    event_ctx, evt
-                )
+                evt.client = self._client_fn(event_ctx, evt)
             except Exception as err:
-                _log_printf(self.logger, "client init failed: %s", err)
+                self._log_fn("client init failed: %s", err)
                 self.update_event_log_status(
                     event_ctx, log_id, EVENT_LOG_STATUS_FAILED, err
                 )
                 self.notify_error(event_ctx, evt, err)
-                decision = _call_retry_policy(self.retry, event_ctx, evt, err)
+                decision = self._retry_decision(event_ctx, evt, err)
                 return decision.retry or decision.nack
 
-        req_id = evt.metadata.get(METADATA_KEY_REQUEST_ID, "")
+        req_id = evt.metadata.get(METADATA_KEY_REQUEST_ID)
         if req_id:
-            _log_printf(
-                self.logger,
+            self._log_fn(
                 "request_id=%s topic=%s provider=%s type=%s",
                 req_id,
                 evt.topic,
@@ -446,23 +554,15 @@ class Worker:
 
         handler = self.topic_handlers.get(topic) or self.type_handlers.get(evt.type)
         if handler is None:
-            _log_printf(self.logger, "no handler for topic=%s type=%s", topic, evt.type)
+            self._log_fn("no handler for topic=%s type=%s", topic, evt.type)
             self.notify_message_finish(event_ctx, evt, None)
             self.update_event_log_status(
                 event_ctx, log_id, EVENT_LOG_STATUS_SUCCESS, None
             )
             return False
 
-        wrapped = self.wrap(handler)
-        last_err: Optional[Exception] = None
-        attempts = self.retry_count + 1
-        for _ in range(attempts):
-            try:
-                wrapped(event_ctx, evt)
-                last_err = None
-                break
-            except Exception as err:
-                last_err = err
+        wrapped = self._wrapped_handler(handler)
+        last_err = self._call_handler(wrapped, event_ctx, evt)
         if last_err is None:
             self.notify_message_finish(event_ctx, evt, None)
             self.update_event_log_status(
@@ -474,27 +574,63 @@ class Worker:
         self.update_event_log_status(
             event_ctx, log_id, EVENT_LOG_STATUS_FAILED, last_err
         )
-        decision = _call_retry_policy(self.retry, event_ctx, evt, last_err)
+        decision = self._retry_decision(event_ctx, evt, last_err)
         return decision.retry or decision.nack
 
+    def _call_handler(
+        self, wrapped: ContextualHandler, ctx: WorkerContext, evt: Event
+    ) -> Optional[Exception]:
+        # First attempt outside the retry loop: the success path does no loop
+        # bookkeeping, and retries only start once it has failed.
+        try:
+            wrapped(ctx, evt)
+            return None
+        except Exception as err:
+            last_err = err
+        for _ in range(self.retry_count):
+            try:
+                wrapped(ctx, evt)
+                return None
+            except Exception as err:
+                last_err = err
+        return last_err
+
+    def _wrapped_handler(self, handler: ContextualHandler) -> ContextualHandler:
+        try:
+            return self._wrapped[handler]
+        except KeyError:
+            wrapped = self._wrapped[handler] = self.wrap(handler)
+            return wrapped
+        except TypeError:
+            return self.wrap(handler)
+
     def wrap(self, handler: ContextualHandler) -> ContextualHandler:
+        if not self.middleware:
+            return handler
         wrapped = handler
         for mw in reversed(self.middleware):
             wrapped = mw(wrapped)
         return wrapped
 
     def build_context(
-        self, base: WorkerContext, topic: str, msg: RelaybusMessage
+        self,
+        base: WorkerContext,
+        topic: str,
+        msg: RelaybusMessage,
+        metadata: Optional[Dict[str, str]] = None,
     ) -> WorkerContext:
-        metadata = msg.metadata or {}
+        # handle_message passes the metadata it already resolved.
+        if metadata is None:
+            metadata = msg.metadata
+        if not metadata:
+            return WorkerContext((base.tenant_id or "").strip(), base.signal, topic)
         metadata_tenant = str(metadata.get(METADATA_KEY_TENANT_ID, "")).strip()
-        tenant_id = metadata_tenant or (base.tenant_id or "").strip()
         return WorkerContext(
-            tenant_id=tenant_id,
-            signal=base.signal,
-            topic=topic,
-            request_id=metadata.get(METADATA_KEY_REQUEST_ID, ""),
-            log_id=metadata.get(METADATA_KEY_LOG_ID, ""),
+            metadata_tenant or (base.tenant_id or "").strip(),
+            base.signal,
+            topic,
+            metadata.get(METADATA_KEY_REQUEST_ID, ""),
+            metadata.get(METADATA_KEY_LOG_ID, ""),
         )
 
     def validate_topics(self, ctx: WorkerContext) -> None:
@@ -543,15 +679,14 @@ class Worker:
             record = client.get_rule(rule_id, ctx)
             if not record.emit:
                 raise ValueError(f"rule {rule_id} has no emit topic")
-            topic = (record.emit[0] or "").strip()
+            topic = sys.intern((record.emit[0] or "").strip())
             if not topic:
                 raise ValueError(f"rule {rule_id} emit topic empty")
             driver_id = (record.driver_id or "").strip()
             if not driver_id:
                 raise ValueError(f"rule {rule_id} driver_id is required")
             if topic in self.topic_handlers:
-                _log_printf(
-                    self.logger,
+                self._log_fn(
                     "overwriting handler for topic=%s due to rule=%s",
                     topic,
                     rule_id,
@@ -561,45 +696,63 @@ class Worker:
             self.topics.append(topic)
 
     def notify_start(self, ctx: WorkerContext) -> None:
-        for listener in self.listeners:
-            listener.OnStart(ctx)
+        for on_start in self._on_start:
+            on_start(ctx)
 
     def notify_exit(self, ctx: WorkerContext) -> None:
-        for listener in self.listeners:
-            listener.OnExit(ctx)
+        for on_exit in self._on_exit:
+            on_exit(ctx)
 
     def notify_message_start(self, ctx: WorkerContext, evt: Event) -> None:
-        for listener in self.listeners:
-            listener.OnMessageStart(ctx, evt)
+        for on_message_start in self._on_message_start:
+            on_message_start(ctx, evt)
 
     def notify_message_finish(
         self, ctx: WorkerContext, evt: Event, err: Optional[Exception]
     ) -> None:
-        for listener in self.listeners:
-            listener.OnMessageFinish(ctx, evt, err)
+        for on_message_finish in self._on_message_finish:
+            on_message_finish(ctx, evt, err)
 
     def notify_error(
         self, ctx: WorkerContext, evt: Optional[Event], err: Exception
     ) -> None:
-        for listener in self.listeners:
-            listener.OnError(ctx, evt, err)
+        for on_error in self._on_error:
+            on_error(ctx, evt, err)
 
     def drivers_client(self) -> DriversClient:
-        return DriversClient(self.api_client_options())
+        return self._api_clients().drivers
 
     def rules_client(self) -> RulesClient:
-        return RulesClient(self.api_client_options())
+        return self._api_clients().rules
 
     def event_logs_client(self) -> EventLogsClient:
-        return EventLogsClient(self.api_client_options())
+        return self._api_clients().event_logs
 
     def api_client_options(self) -> APIClientOptions:
-        return APIClientOptions(
-            base_url=self.endpoint,
-            api_key=self.api_key,
-            oauth2_config=self.oauth2_config,
-            tenant_id=self.tenant_id,
-        )
+        return self._api_clients().opts
+
+    def _api_clients(self) -> "_APIClients":
+        # Rebuilt only when the connection settings change, so per-message
+        # status updates reuse one options object and the record caches live
+        # across calls.
+        clients = self._api
+        if (
+            clients is None
+            or clients.opts.base_url != self.endpoint
+            or clients.opts.api_key != self.api_key
+            or clients.opts.oauth2_config is not self.oauth2_config
+            or clients.opts.tenant_id != self.tenant_id
+        ):
+            clients = _APIClients(
+                APIClientOptions(
+                    base_url=self.endpoint,
+                    api_key=self.api_key,
+                    oauth2_config=self.oauth2_config,
+                    tenant_id=self.tenant_id,
+                )
+            )
+            self._api = clients
+        return clients
 
     def update_event_log_status(
         self,
@@ -610,10 +763,90 @@ class Worker:
     ) -> None:
         if not log_id:
             return
+        # Sent from a background thread so the API round-trip stays off the
+        # message path; a full queue or a closed worker sends inline. Enqueuing
+        # under the lock keeps every update ahead of close()'s stop marker.
+        update = (ctx, log_id, status, str(err or ""))
+        with self._status_lock:
+            if not self._status_closed:
+                try:
+                    self._status_updates().put_nowait(update)
+                    return
+                except queue.Full:
+                    pass
+        self._send_event_log_status(*update)
+
+    def _send_event_log_status(
+        self, ctx: WorkerContext, log_id: str, status: str, message: str
+    ) -> None:
         try:
-            self.event_logs_client().update_status(log_id, status, str(err or ""), ctx)
+            self.event_logs_client().update_status(log_id, status, message, ctx)
         except Exception as update_err:
-            _log_printf(self.logger, "event log update failed: %s", update_err)
+            self._log_fn("event log update failed: %s", update_err)
+
+    def _status_updates(self) -> "queue.Queue[Optional[_StatusUpdate]]":
+        # Caller holds _status_lock.
+        updates = self._status_queue
+        if updates is None:
+            updates = queue.Queue(maxsize=STATUS_QUEUE_SIZE)
+            sender = threading.Thread(
+                target=self._drain_status_updates,
+                args=(updates,),
+                name="relaymesh-event-log",
+                daemon=True,
+            )
+            sender.start()
+            self._status_queue = updates
+            self._status_sender = sender
+        return updates
+
+    def _drain_status_updates(
+        self, updates: "queue.Queue[Optional[_StatusUpdate]]"
+    ) -> None:
+        while True:
+            update = updates.get()
+            if update is None:
+                break
+            self._send_event_log_status(*update)
+        # Flush whatever was queued behind the stop marker.
+        self._flush_status_updates(updates)
+
+    def _flush_status_updates(
+        self, updates: "queue.Queue[Optional[_StatusUpdate]]"
+    ) -> None:
+        while True:
+            try:
+                update = updates.get_nowait()
+            except queue.Empty:
+                return
+            if update is not None:
+                self._send_event_log_status(*update)
+
+    def _stop_status_updates(self) -> None:
+        with self._status_stop_lock:
+            self._stop_status_sender()
+
+    def _stop_status_sender(self) -> None:
+        # Caller holds _status_stop_lock.
+        with self._status_lock:
+            self._status_closed = True
+            updates, sender = self._status_queue, self._status_sender
+            self._status_queue = self._status_sender = None
+        if updates is None or sender is None:
+            return
+        try:
+            updates.put(None, timeout=STATUS_DRAIN_TIMEOUT_SECONDS)
+        except queue.Full:
+            # The sender is stuck behind a full backlog. Nothing enqueues once
+            # closed, so send the rest from here, then let the sender exit.
+            self._log_fn(
+                "event log status queue full at close; sending %d updates inline",
+                updates.qsize(),
+            )
+            self._flush_status_updates(updates)
+            updates.put_nowait(None)
+        if sender is not threading.current_thread():
+            sender.join(STATUS_DRAIN_TIMEOUT_SECONDS)
 
     def bind_client_provider(self) -> None:
         if self.client_provider is None:
@@ -626,6 +859,19 @@ class Worker:
             provider.BindAPIClient(opts)
 
 
+_StatusUpdate = Tuple[WorkerContext, str, str, str]
+
+
+class _APIClients:
+    __slots__ = ("opts", "drivers", "rules", "event_logs")
+
+    def __init__(self, opts: APIClientOptions) -> None:
+        self.opts = opts
+        self.drivers = DriversClient(opts)
+        self.rules = RulesClient(opts)
+        self.event_logs = EventLogsClient(opts)
+
+
 def New(*options: WorkerOption) -> Worker:
     return Worker.new(*options)
 
@@ -696,26 +942,25 @@ def WithValidateTopics(validate: bool) -> WorkerOption:
 
 class _StdLogger:
     def printf(self, fmt: str, *args: Any) -> None:
-        if args:
-            print(f"relaymesh/worker {fmt % args}")
-        else:
-            print(f"relaymesh/worker {fmt}")
+        _stdout_printf(fmt, *args)
 
     def Printf(self, fmt: str, *args: Any) -> None:
         self.printf(fmt, *args)
 
 
-def _log_printf(logger: Logger, fmt: str, *args: Any) -> None:
-    if hasattr(logger, "Printf"):
-        logger.Printf(fmt, *args)
-        return
-    if hasattr(logger, "printf"):
-        logger.printf(fmt, *args)
-        return
-    if args:
-        print(f"relaymesh/worker {fmt % args}")
-    else:
-        print(f"relaymesh/worker {fmt}")
+def _resolve_printf(logger: Logger) -> Callable[..., None]:
+    return (
+        getattr(logger, "Printf", None)
+        or getattr(logger, "printf", None)
+        or _stdout_printf
+    )
+
+
+def _stdout_printf(fmt: str, *args: Any) -> None:
+    # One write per line: print() issues the text and the newline separately,
+    # which also lets lines from concurrent handlers interleave.
+    line = fmt % args if args else fmt
+    sys.stdout.write(f"relaymesh/worker {line}\n")
 
 
 def _resolve_client_provider(
@@ -728,49 +973,72 @@ def _resolve_client_provider(
     return lambda _ctx, _evt: None
 
 
+# Arity decisions per handler, so re-registering the same callable does not
+# re-inspect it. Only a bool is stored, which keeps the key collectable.
+_takes_context_cache: "weakref.WeakKeyDictionary[Any, bool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def _to_context_handler(handler: Handler) -> ContextualHandler:
+    try:
+        takes_context = _takes_context_cache[handler]
+    except (KeyError, TypeError):
+        takes_context = _takes_context(handler)
+        try:
+            _takes_context_cache[handler] = takes_context
+        except TypeError:
+            pass
+    if takes_context:
+        return handler  # type: ignore[return-value]
+    return lambda _ctx, evt: handler(evt)  # type: ignore[misc]
+
+
+def _takes_context(handler: Handler) -> bool:
+    func = getattr(handler, "__func__", handler)
+    code = getattr(func, "__code__", None)
+    # Plain functions and bound methods are answered from the code object;
+    # anything decorated or otherwise unusual goes through inspect.signature.
+    if (
+        code is not None
+        and not hasattr(func, "__wrapped__")
+        and not hasattr(handler, "__signature__")
+    ):
+        if code.co_flags & inspect.CO_VARARGS:
+            return True
+        bound = 1 if func is not handler else 0
+        return code.co_argcount - bound >= 2
     try:
         sig = inspect.signature(handler)
-        params = [
-            param
-            for param in sig.parameters.values()
-            if param.kind
-            in (
-                inspect.Parameter.POSITIONAL_ONLY,
-                inspect.Parameter.POSITIONAL_OR_KEYWORD,
-            )
-        ]
-        has_varargs = any(
-            param.kind == inspect.Parameter.VAR_POSITIONAL
-            for param in sig.parameters.values()
-        )
-        if has_varargs or len(params) >= 2:
-            return handler  # type: ignore[return-value]
     except (ValueError, TypeError):
-        return lambda _ctx, evt: handler(evt)  # type: ignore[misc]
-
-    return lambda _ctx, evt: handler(evt)  # type: ignore[misc]
+        return False
+    params = [
+        param
+        for param in sig.parameters.values()
+        if param.kind
+        in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        )
+    ]
+    has_varargs = any(
+        param.kind == inspect.Parameter.VAR_POSITIONAL
+        for param in sig.parameters.values()
+    )
+    return has_varargs or len(params) >= 2
 
 
-def _call_retry_policy(
-    policy: RetryPolicy, ctx: WorkerContext, evt: Optional[Event], err: Exception
-):
-    if hasattr(policy, "OnError"):
-        return normalize_retry_decision(policy.OnError(ctx, evt, err))
-    return normalize_retry_decision(policy.on_error(ctx, evt, err))
+_REQUEUE_DRIVERS = frozenset(("amqp",))
 
 
 def _should_requeue(msg: RelaybusMessage) -> bool:
-    driver = (msg.metadata or {}).get(METADATA_KEY_DRIVER, "").lower()
-    return driver == "amqp"
+    driver = msg.metadata.get(METADATA_KEY_DRIVER) if msg.metadata else None
+    if not driver:
+        return False
+    # Subscribers stamp the already-lowercased driver name; only metadata set
+    # upstream needs folding.
+    return driver in _REQUEUE_DRIVERS or driver.lower() in _REQUEUE_DRIVERS
 
 
 def _unique(values: Sequence[str]) -> List[str]:
-    seen: Set[str] = set()
-    out: List[str] = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        out.append(value)
-    return out
+    return list(dict.fromkeys(values))
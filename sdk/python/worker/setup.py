@@ -28,9 +28,11 @@ setup(
     python_requires=">=3.9",
     packages=find_packages(where=".", include=["relaymesh*", "cloud*", "buf*"]),
     install_requires=[
+        "orjson>=3.8",
         "protobuf>=6.33.5",
         "relaybus-amqp",
         "relaybus-kafka",
         "relaybus-nats",
+        "requests>=2.28",
     ],
 )
@@ -0,0 +1,173 @@
+import dataclasses
+import http.server
+import os
+import threading
+import unittest
+from typing import Dict, List
+from unittest import mock
+
+from relaymesh import api
+from relaymesh.api import APIClientOptions, DriversClient, RulesClient
+from relaymesh.context import WorkerContext
+
+
+def driver_payload(*ids):
+    return {
+        "drivers": [
+            {"id": driver_id, "name": "amqp", "config_json": "{}", "enabled": True}
+            for driver_id in ids
+        ]
+    }
+
+
+class DriversClientCacheTests(unittest.TestCase):
+    def test_get_driver_by_id_reuses_list_response(self):
+        client = DriversClient(APIClientOptions(base_url="http://api"))
+        with mock.patch(
+            "relaymesh.api._post_json", return_value=driver_payload("d1", "d2")
+        ) as post:
+            first = client.get_driver_by_id("d1")
+            second = client.get_driver_by_id("d2")
+
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertEqual(post.call_count, 1)
+
+    def test_unknown_driver_is_served_from_index(self):
+        client = DriversClient(APIClientOptions(base_url="http://api"))
+        with mock.patch(
+            "relaymesh.api._post_json", return_value=driver_payload("d1")
+        ) as post:
+            self.assertIsNone(client.get_driver_by_id("missing"))
+            self.assertIsNone(client.get_driver_by_id("missing"))
+
+        self.assertEqual(post.call_count, 1)
+
+    def test_cache_is_scoped_by_tenant(self):
+        client = DriversClient(APIClientOptions(base_url="http://api"))
+        with mock.patch(
+            "relaymesh.api._post_json", return_value=driver_payload("d1")
+        ) as post:
+            client.get_driver_by_id("d1", WorkerContext(tenant_id="acme"))
+            client.get_driver_by_id("d1", WorkerContext(tenant_id="globex"))
+
+        self.assertEqual(post.call_count, 2)
+
+    def test_mutating_returned_driver_does_not_change_cache(self):
+        client = DriversClient(APIClientOptions(base_url="http://api"))
+        with mock.patch("relaymesh.api._post_json", return_value=driver_payload("d1")):
+            first = client.get_driver_by_id("d1")
+            assert first is not None
+            first.enabled = False
+            second = client.get_driver_by_id("d1")
+
+        assert second is not None
+        self.assertTrue(second.enabled)
+
+
+class RulesClientCacheTests(unittest.TestCase):
+    def test_mutating_returned_rule_does_not_change_cache(self):
+        client = RulesClient(APIClientOptions(base_url="http://api"))
+        payload = {"rule": {"id": "r1", "emit": ["topic"], "driver_id": "d1"}}
+        with mock.patch("relaymesh.api._post_json", return_value=payload):
+            first = client.get_rule("r1")
+            first.emit.append("other")
+            first.driver_id = "d2"
+            cached = client.get_rule("r1")
+            cached.emit.clear()
+            second = client.get_rule("r1")
+
+        self.assertEqual(second.emit, ["topic"])
+        self.assertEqual(second.driver_id, "d1")
+        self.assertEqual(payload["rule"]["emit"], ["topic"])
+
+    def test_invalidate_forces_refetch(self):
+        client = RulesClient(APIClientOptions(base_url="http://api"))
+        payload = {"rule": {"id": "r1", "emit": ["topic"], "driver_id": "d1"}}
+        with mock.patch("relaymesh.api._post_json", return_value=payload) as post:
+            client.get_rule("r1")
+            client.get_rule("r1")
+            client.invalidate("r1")
+            client.get_rule("r1")
+
+        self.assertEqual(post.call_count, 2)
+
+
+class APIAuthCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(api._invalidate_env_cache)
+
+    def test_env_invalidation_rebuilds_cached_auth_headers(self):
+        opts = APIClientOptions(base_url="http://api")
+        with mock.patch.dict(os.environ, {"RELAYMESH_API_KEY": "key-1"}):
+            api._invalidate_env_cache()
+            first = api._request_headers(opts, None)
+            os.environ["RELAYMESH_API_KEY"] = "key-2"
+            cached = api._request_headers(opts, None)
+            api._invalidate_env_cache()
+            rebuilt = api._request_headers(opts, None)
+
+        self.assertEqual(first["X-API-Key"], "key-1")
+        self.assertEqual(cached["X-API-Key"], "key-1")
+        self.assertEqual(rebuilt["X-API-Key"], "key-2")
+
+    def test_replaced_options_do_not_share_the_auth_cache(self):
+        opts = APIClientOptions(base_url="http://api", api_key="key-1")
+        api._request_headers(opts, None)
+
+        copy = dataclasses.replace(opts, api_key="key-2")
+
+        self.assertIsNot(copy.auth_cache, opts.auth_cache)
+        self.assertEqual(api._request_headers(copy, None)["X-API-Key"], "key-2")
+
+
+class _RecordingServer(http.server.HTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RecordingHandler)
+        self.seen: List[Dict[str, str]] = []
+
+
+class _RecordingHandler(http.server.BaseHTTPRequestHandler):
+    server: _RecordingServer
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.seen.append(dict(self.headers))
+        self.send_response(200)
+        self.send_header("Set-Cookie", "sid=tenant-acme; Path=/")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        return None
+
+
+class ControlPlaneSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = _RecordingServer()
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def test_response_cookie_is_not_sent_for_another_tenant(self):
+        DriversClient(
+            APIClientOptions(base_url=self.base_url, api_key="key-a")
+        ).list_drivers(WorkerContext(tenant_id="acme"))
+        DriversClient(
+            APIClientOptions(base_url=self.base_url, api_key="key-b")
+        ).list_drivers(WorkerContext(tenant_id="globex"))
+
+        self.assertEqual(len(self.server.seen), 2)
+        self.assertNotIn("Cookie", self.server.seen[1])
+        self.assertEqual(self.server.seen[1]["X-API-Key"], "key-b")
+        self.assertEqual(self.server.seen[1]["X-Tenant-ID"], "globex")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from cloud.v1 import githooks_pb2
+
+from relaymesh.codec import DefaultCodec
+from relaymesh.types import RelaybusMessage
+
+
+class DefaultCodecBatchTests(unittest.TestCase):
+    def test_decode_batch_protobuf_returns_single_event(self):
+        # Generated protobuf classes are created at import time; pyright
+        # cannot see them on the module.
+        event_payload = githooks_pb2.EventPayload  # type: ignore[attr-defined]
+        payload = event_payload(
+            provider="github", name="push", payload=b'{"ref":"main"}'
+        ).SerializeToString()
+
+        events = DefaultCodec().decode_batch(
+            "topic", RelaybusMessage(topic="topic", payload=payload)
+        )
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].provider, "github")
+        self.assertEqual(events[0].normalized, {"ref": "main"})
+
+    def test_decode_batch_json_array_fans_out(self):
+        payload = b'[{"provider":"github","name":"push","data":{"n":1}},{"n":2}]'
+
+        events = DefaultCodec().decode_batch(
+            "topic",
+            RelaybusMessage(topic="topic", payload=payload, metadata={"log_id": "l"}),
+        )
+
+        self.assertEqual([evt.normalized for evt in events], [{"n": 1}, {"n": 2}])
+        self.assertEqual(events[0].type, "push")
+        self.assertEqual([evt.log_id for evt in events], ["l", "l"])
+
+    def test_decode_batch_ndjson_fans_out(self):
+        payload = b'{"n":1}\n\n{"n":2}\n'
+
+        events = DefaultCodec().decode_batch(
+            "topic", RelaybusMessage(topic="topic", payload=payload)
+        )
+
+        self.assertEqual([evt.payload for evt in events], [b'{"n":1}', b'{"n":2}'])
+
+    def test_decode_batch_multiline_document_is_single_event(self):
+        payload = b'{\n  "n": 1\n}\n'
+
+        events = DefaultCodec().decode_batch(
+            "topic", RelaybusMessage(topic="topic", payload=payload)
+        )
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].normalized, {"n": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from relaymesh import oauth2
+from relaymesh.oauth2 import OAuth2Config, oauth2_token_from_config
+
+
+class OAuth2TokenCacheTests(unittest.TestCase):
+    def setUp(self):
+        oauth2._token_cache = oauth2._TokenCache()
+
+    def test_concurrent_misses_fetch_token_once(self):
+        cfg = OAuth2Config(
+            token_url="https://issuer.example.com/token",
+            client_id="client",
+            client_secret="secret",
+        )
+
+        def slow_fetch(*_args):
+            time.sleep(0.05)
+            return "token-1", 1800
+
+        results = []
+        with mock.patch.object(oauth2, "_fetch_token", side_effect=slow_fetch) as fetch:
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(oauth2_token_from_config(None, cfg))
+                )
+                for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(results, ["token-1"] * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sys
+import types
+import unittest
+from unittest import mock
+
+from relaymesh import subscriber
+from relaymesh.config import SubscriberConfig
+
+
+class FakeAdapter:
+    def __init__(self, sub, errors):
+        self.sub = sub
+        self.errors = list(errors)
+        self.starts = 0
+
+    def start(self, topic):
+        self.starts += 1
+        err = self.errors.pop(0)
+        if not self.errors:
+            self.sub.close()
+        raise err
+
+    def close(self):
+        return None
+
+
+def _subscriber(*errors):
+    sub = subscriber._RelaybusSubscriber(SubscriberConfig(driver="amqp"), "amqp")
+    adapter = FakeAdapter(sub, errors)
+    sub._inner = adapter
+    return sub, adapter
+
+
+class RelaybusSubscriberConsumeTests(unittest.TestCase):
+    def test_adapter_error_ends_consumption(self):
+        sub, adapter = _subscriber(RuntimeError("broker gone"), RuntimeError("unused"))
+
+        sub._consume("topic")
+
+        self.assertEqual(adapter.starts, 1)
+        self.assertFalse(sub._closed.is_set())
+
+    def test_error_after_close_ends_consumption_quietly(self):
+        sub, adapter = _subscriber(RuntimeError("connection closed"))
+
+        sub._consume("topic")
+
+        self.assertEqual(adapter.starts, 1)
+
+    def test_idle_poll_timeouts_do_not_back_off(self):
+        sub, adapter = _subscriber(TimeoutError(), TimeoutError(), TimeoutError())
+
+        with mock.patch.object(
+            subscriber, "_MIN_IDLE_POLL_SECONDS", 0.0
+        ), mock.patch.object(sub._closed, "wait", return_value=False) as wait:
+            sub._consume("topic")
+
+        wait.assert_not_called()
+        self.assertEqual(adapter.starts, 3)
+
+    def test_fast_timeouts_back_off(self):
+        sub, _ = _subscriber(TimeoutError(), TimeoutError(), TimeoutError())
+
+        with mock.patch.object(sub._closed, "wait", return_value=False) as wait:
+            sub._consume("topic")
+
+        self.assertEqual(
+            wait.call_args_list, [mock.call(0.1), mock.call(0.2), mock.call(0.4)]
+        )
+
+
+class RelaybusSubscriberRestartTests(unittest.TestCase):
+    def test_start_after_close_consumes_again(self):
+        cfg = SubscriberConfig(driver="amqp")
+        cfg.amqp.url = "amqp://broker"
+        sub = subscriber._RelaybusSubscriber(cfg, "amqp")
+        adapters = []
+
+        def connect(config):
+            adapter = FakeAdapter(sub, [RuntimeError("connection closed")])
+            adapters.append(adapter)
+            return adapter
+
+        relaybus_amqp = types.SimpleNamespace(
+            AmqpSubscriber=types.SimpleNamespace(connect=connect),
+            AmqpSubscriberConnectConfig=lambda **kwargs: kwargs,
+        )
+        with mock.patch.dict(sys.modules, {"relaybus_amqp": relaybus_amqp}):
+            sub.start("topic", lambda msg: None)
+            sub.start("topic", lambda msg: None)
+
+        self.assertEqual([a.starts for a in adapters], [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+from typing import Dict, List
+from unittest import mock
+
+from relaymesh.scm_clients import GitHubClient
+
+
+class _RecordingServer(http.server.HTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RecordingHandler)
+        self.seen: List[Dict[str, str]] = []
+
+
+class _RecordingHandler(http.server.BaseHTTPRequestHandler):
+    server: _RecordingServer
+
+    def do_GET(self):
+        self.server.seen.append(dict(self.headers))
+        self.send_response(200)
+        self.send_header("Set-Cookie", "sid=installation-1; Path=/")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        return None
+
+
+class SharedSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = _RecordingServer()
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def test_response_cookie_is_not_sent_for_another_installation(self):
+        GitHubClient("token-1", self.base_url).request("GET", "/repos")
+        GitHubClient("token-2", self.base_url).request("GET", "/repos")
+
+        self.assertEqual(len(self.server.seen), 2)
+        self.assertNotIn("Cookie", self.server.seen[1])
+        self.assertEqual(self.server.seen[1]["Authorization"], "Bearer token-2")
+
+    def test_netrc_does_not_replace_authorization_header(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "netrc")
+            with open(path, "w") as f:
+                f.write("machine 127.0.0.1 login user password secret\n")
+            with mock.patch.dict(os.environ, {"NETRC": path}):
+                GitHubClient("token-1", self.base_url).request("GET", "/repos")
+
+        self.assertEqual(self.server.seen[0]["Authorization"], "Bearer token-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
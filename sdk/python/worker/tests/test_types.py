@@ -0,0 +1,75 @@
+import unittest
+from types import MappingProxyType, SimpleNamespace
+
+from relaymesh.types import RelaybusMessage, coerce_message
+
+
+class CoerceMessageTests(unittest.TestCase):
+    def test_default_metadata_with_none_message_metadata(self):
+        # Adapter messages are untyped; metadata=None does reach coerce_message.
+        msg = RelaybusMessage(
+            topic="topic", payload=b"{}", metadata=None  # type: ignore[arg-type]
+        )
+
+        coerced = coerce_message(msg, {"driver": "amqp"})
+
+        self.assertEqual(coerced.metadata, {"driver": "amqp"})
+
+    def test_default_metadata_with_pair_list_metadata(self):
+        msg = SimpleNamespace(topic="topic", payload=b"{}", metadata=[("log_id", "l")])
+
+        coerced = coerce_message(msg, {"driver": "amqp", "log_id": "default"})
+
+        self.assertEqual(coerced.metadata, {"driver": "amqp", "log_id": "l"})
+
+    def test_relaybus_message_none_metadata_becomes_dict(self):
+        msg = RelaybusMessage(
+            topic="topic", payload=b"{}", metadata=None  # type: ignore[arg-type]
+        )
+
+        self.assertEqual(coerce_message(msg).metadata, {})
+
+    def test_relaybus_message_mapping_metadata_becomes_dict(self):
+        metadata = MappingProxyType({"a": "b"})
+        msg = RelaybusMessage(
+            topic="topic", payload=b"{}", metadata=metadata  # type: ignore[arg-type]
+        )
+
+        coerced = coerce_message(msg)
+
+        self.assertIs(type(coerced.metadata), dict)
+        self.assertEqual(coerced.metadata, {"a": "b"})
+
+    def test_relaybus_message_dict_metadata_is_not_copied(self):
+        metadata = {"a": "b"}
+        msg = RelaybusMessage(topic="topic", payload=b"{}", metadata=metadata)
+
+        self.assertIs(coerce_message(msg).metadata, metadata)
+
+    def test_default_metadata_leaves_input_message_untouched(self):
+        metadata = {"log_id": "l"}
+        msg = RelaybusMessage(topic="topic", payload=b"{}", metadata=metadata)
+
+        coerced = coerce_message(msg, {"driver": "amqp"})
+
+        self.assertEqual(coerced.metadata, {"driver": "amqp", "log_id": "l"})
+        self.assertIs(msg.metadata, metadata)
+        self.assertEqual(metadata, {"log_id": "l"})
+        self.assertEqual(
+            coerce_message(msg, {"driver": "kafka"}).metadata,
+            {"driver": "kafka", "log_id": "l"},
+        )
+
+    def test_mapping_metadata_is_not_written_back(self):
+        metadata = MappingProxyType({"a": "b"})
+        msg = RelaybusMessage(
+            topic="topic", payload=b"{}", metadata=metadata  # type: ignore[arg-type]
+        )
+
+        coerce_message(msg)
+
+        self.assertIs(msg.metadata, metadata)
+
+
+if __name__ == "__main__":
+    unittest.main()
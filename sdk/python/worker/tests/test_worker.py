@@ -1,7 +1,13 @@
+import sys
+import threading
+import time
+import types
 import unittest
+from unittest import mock
 
 from relaymesh.context import WorkerContext
 from relaymesh.codec import Codec
+from relaymesh.config import SubscriberConfig
 from relaymesh.event import Event
 from relaymesh.event_log_status import (
     EVENT_LOG_STATUS_FAILED,
@@ -10,11 +16,14 @@ from relaymesh.event_log_status import (
 from relaymesh.listener import Listener
 from relaymesh.retry import RetryPolicy
 from relaymesh.retry import RetryDecision
+from relaymesh.subscriber import Subscriber, _RelaybusSubscriber
 from relaymesh.types import RelaybusMessage
 from relaymesh.worker import Worker, WorkerOptions
 
 
 class TestCodec(Codec):
+    __slots__ = ("_event", "_err")
+
     def __init__(self, event=None, err=None):
         self._event = event
         self._err = err
@@ -28,6 +37,8 @@ class TestCodec(Codec):
 
 
 class TestRetryPolicy(RetryPolicy):
+    __slots__ = ("decision", "calls", "last_evt", "last_err")
+
     def __init__(self, decision):
         self.decision = decision
         self.calls = 0
@@ -42,6 +53,8 @@ class TestRetryPolicy(RetryPolicy):
 
 
 class TestListener(Listener):
+    __slots__ = ("finish_calls", "error_calls")
+
     def __init__(self):
         self.finish_calls = []
         self.error_calls = []
@@ -62,120 +75,338 @@ class TestListener(Listener):
         self.error_calls.append((evt, err))
 
 
-class TestWorker(Worker):
-    def __init__(self, opts, status_calls):
-        super().__init__(opts)
-        self._status_calls = status_calls
+class _StatusRecorder:
+    # Stands in for Worker.update_event_log_status; err is kept as passed.
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ctx, log_id, status, err):
+        self.calls.append((log_id, status, err))
+
+
+TOPIC = "topic"
+PAYLOAD = b"{}"
+
+
+def _event():
+    return Event(
+        provider="github",
+        type="push",
+        topic=TOPIC,
+        metadata={},
+        payload=PAYLOAD,
+    )
 
-    def update_event_log_status(self, ctx, log_id, status, err):
-        self._status_calls.append((log_id, status, str(err or "")))
+
+def _message(log_id):
+    return RelaybusMessage(topic=TOPIC, payload=PAYLOAD, metadata={"log_id": log_id})
+
+
+def _noop_handler(ctx, evt):
+    return None
 
 
 class WorkerHandleMessageTests(unittest.TestCase):
+    def setUp(self):
+        # handle_message never backs off; a sleep here would stall every delivery.
+        patcher = mock.patch("time.sleep", return_value=None)
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _make_worker(self, codec, retry, listener, recorder):
+        worker = Worker(WorkerOptions(codec=codec, retry=retry, listeners=[listener]))
+        worker.update_event_log_status = recorder
+        return worker
+
     def test_handle_message_success_updates_success_status(self):
-        event = Event(
-            provider="github",
-            type="push",
-            topic="topic",
-            metadata={},
-            payload=b"{}",
-        )
         retry = TestRetryPolicy(RetryDecision(retry=False, nack=True))
         listener = TestListener()
-        status_calls = []
-        worker = TestWorker(
-            WorkerOptions(
-                codec=TestCodec(event=event),
-                retry=retry,
-                listeners=[listener],
-            ),
-            status_calls,
-        )
-        worker.topic_handlers["topic"] = lambda ctx, evt: None
+        rec = _StatusRecorder()
+        worker = self._make_worker(TestCodec(event=_event()), retry, listener, rec)
+        worker.topic_handlers[TOPIC] = _noop_handler
 
         should_nack = worker.handle_message(
-            WorkerContext(tenant_id="acme"),
-            "topic",
-            RelaybusMessage(topic="topic", payload=b"{}", metadata={"log_id": "log-1"}),
+            WorkerContext(tenant_id="acme"), TOPIC, _message("log-1")
         )
 
         self.assertFalse(should_nack)
         self.assertEqual(retry.calls, 0)
         self.assertEqual(listener.finish_calls, [None])
-        self.assertEqual(status_calls, [("log-1", EVENT_LOG_STATUS_SUCCESS, "")])
+        self.assertEqual(rec.calls, [("log-1", EVENT_LOG_STATUS_SUCCESS, None)])
+        self.sleep.assert_not_called()
 
     def test_handle_message_handler_error_updates_failed_status(self):
-        event = Event(
-            provider="github",
-            type="push",
-            topic="topic",
-            metadata={},
-            payload=b"{}",
-        )
+        err = RuntimeError("handler failed")
         retry = TestRetryPolicy(RetryDecision(retry=False, nack=True))
         listener = TestListener()
-        status_calls = []
-        worker = TestWorker(
-            WorkerOptions(
-                codec=TestCodec(event=event),
-                retry=retry,
-                listeners=[listener],
-            ),
-            status_calls,
-        )
+        rec = _StatusRecorder()
+        worker = self._make_worker(TestCodec(event=_event()), retry, listener, rec)
 
         def fail_handler(ctx, evt):
-            raise RuntimeError("handler failed")
+            raise err
 
-        worker.topic_handlers["topic"] = fail_handler
+        worker.topic_handlers[TOPIC] = fail_handler
 
         should_nack = worker.handle_message(
-            WorkerContext(tenant_id="acme"),
-            "topic",
-            RelaybusMessage(topic="topic", payload=b"{}", metadata={"log_id": "log-2"}),
+            WorkerContext(tenant_id="acme"), TOPIC, _message("log-2")
         )
 
         self.assertTrue(should_nack)
         self.assertEqual(retry.calls, 1)
         self.assertIsNotNone(retry.last_evt)
-        self.assertEqual(str(retry.last_err), "handler failed")
+        self.assertIs(retry.last_err, err)
         self.assertEqual(len(listener.error_calls), 1)
         self.assertIsNotNone(listener.error_calls[0][0])
-        self.assertEqual(str(listener.error_calls[0][1]), "handler failed")
-        self.assertEqual(
-            status_calls,
-            [("log-2", EVENT_LOG_STATUS_FAILED, "handler failed")],
-        )
+        self.assertIs(listener.error_calls[0][1], err)
+        self.assertEqual(rec.calls, [("log-2", EVENT_LOG_STATUS_FAILED, err)])
+        self.sleep.assert_not_called()
 
     def test_handle_message_decode_error_uses_nil_event(self):
+        err = ValueError("decode failed")
         retry = TestRetryPolicy(RetryDecision(retry=True, nack=False))
         listener = TestListener()
-        status_calls = []
-        worker = TestWorker(
-            WorkerOptions(
-                codec=TestCodec(err=ValueError("decode failed")),
-                retry=retry,
-                listeners=[listener],
-            ),
-            status_calls,
-        )
+        rec = _StatusRecorder()
+        worker = self._make_worker(TestCodec(err=err), retry, listener, rec)
 
         should_nack = worker.handle_message(
-            WorkerContext(tenant_id="acme"),
-            "topic",
-            RelaybusMessage(topic="topic", payload=b"{}", metadata={"log_id": "log-3"}),
+            WorkerContext(tenant_id="acme"), TOPIC, _message("log-3")
         )
 
         self.assertTrue(should_nack)
         self.assertEqual(retry.calls, 1)
         self.assertIsNone(retry.last_evt)
-        self.assertEqual(str(retry.last_err), "decode failed")
+        self.assertIs(retry.last_err, err)
         self.assertEqual(len(listener.error_calls), 1)
         self.assertIsNone(listener.error_calls[0][0])
-        self.assertEqual(str(listener.error_calls[0][1]), "decode failed")
+        self.assertIs(listener.error_calls[0][1], err)
+        self.assertEqual(rec.calls, [("log-3", EVENT_LOG_STATUS_FAILED, err)])
+        self.sleep.assert_not_called()
+
+    def test_handle_message_builds_middleware_chain_once(self):
+        event = _event()
+        wraps = []
+
+        def middleware(next_handler):
+            wraps.append(next_handler)
+            return next_handler
+
+        handled = []
+        worker = Worker(
+            WorkerOptions(codec=TestCodec(event=event), middleware=[middleware])
+        )
+        worker.update_event_log_status = _StatusRecorder()
+        worker.topic_handlers[TOPIC] = lambda ctx, evt: handled.append(evt)
+
+        for _ in range(3):
+            worker.handle_message(
+                WorkerContext(tenant_id="acme"),
+                TOPIC,
+                RelaybusMessage(topic=TOPIC, payload=PAYLOAD),
+            )
+
+        self.assertEqual(len(wraps), 1)
+        self.assertEqual(handled, [event] * 3)
+
+
+class _PoolAdapter:
+    # A relaybus adapter that dispatches each message on its own thread; the
+    # worker cannot assume adapters call the handler from a single thread.
+    __slots__ = ("config", "messages", "sub")
+
+    def __init__(self, config, messages, sub):
+        self.config = config
+        self.messages = messages
+        self.sub = sub
+
+    def start(self, topic):
+        threads = [
+            threading.Thread(target=self.config["on_message"], args=(msg,))
+            for msg in self.messages
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.sub.close()
+        raise RuntimeError("connection closed")
+
+    def close(self):
+        return None
+
+
+class WorkerConcurrencyTests(unittest.TestCase):
+    def test_driver_subscriber_handlers_respect_concurrency(self):
+        worker = Worker(WorkerOptions(codec=TestCodec(event=_event()), concurrency=1))
+        worker.update_event_log_status = _StatusRecorder()
+        cfg = SubscriberConfig(driver="amqp")
+        cfg.amqp.url = "amqp://broker"
+        sub = _RelaybusSubscriber(cfg, "amqp")
+        worker.driver_subs["d1"] = sub
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def handler(ctx, evt):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        worker.topic_handlers[TOPIC] = handler
+        messages = [_message(""), _message("")]
+        relaybus_amqp = types.SimpleNamespace(
+            AmqpSubscriber=types.SimpleNamespace(
+                connect=lambda config: _PoolAdapter(config, messages, sub)
+            ),
+            AmqpSubscriberConnectConfig=lambda **kwargs: kwargs,
+        )
+        with mock.patch.dict(sys.modules, {"relaybus_amqp": relaybus_amqp}):
+            worker.run_driver_subscribers(
+                WorkerContext(tenant_id="acme"), {"d1": [TOPIC]}
+            )
+
+        self.assertEqual(peak[0], 1)
+
+
+class _DeliveringSubscriber(Subscriber):
+    # Delivers the given messages, then blocks like a broker until close().
+    __slots__ = ("messages", "delivered", "_closed")
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.delivered = threading.Event()
+        self._closed = threading.Event()
+
+    def start(self, topic, handler):
+        self._closed.clear()
+        for msg in self.messages:
+            handler(msg)
+        self.delivered.set()
+        self._closed.wait(5)
+
+    def close(self):
+        self._closed.set()
+
+
+class WorkerEventLogStatusTests(unittest.TestCase):
+    def _run_until_delivered(self, worker, sub):
+        signal = threading.Event()
+
+        def stop_when_delivered():
+            sub.delivered.wait(5)
+            signal.set()
+
+        stopper = threading.Thread(target=stop_when_delivered, daemon=True)
+        stopper.start()
+        worker.Run(signal)
+        stopper.join(5)
+
+    def test_run_delivers_queued_status_updates_before_returning(self):
+        sub = _DeliveringSubscriber([_message(f"log-{i}") for i in range(3)])
+        worker = Worker(
+            WorkerOptions(
+                endpoint="http://api",
+                codec=TestCodec(event=_event()),
+                subscriber=sub,
+                validate_topics=False,
+            )
+        )
+        worker.handle_topic(TOPIC, _noop_handler)
+
+        def update_status(log_id, status, message, ctx):
+            time.sleep(0.05)
+
+        with mock.patch.object(
+            worker.event_logs_client(), "update_status", side_effect=update_status
+        ) as update:
+            self._run_until_delivered(worker, sub)
+            sent = [c.args[0] for c in update.call_args_list]
+
+        self.assertEqual(sent, ["log-0", "log-1", "log-2"])
+
+    def test_run_after_close_sends_status_from_background_thread(self):
+        sub = _DeliveringSubscriber([_message("log-1")])
+        worker = Worker(
+            WorkerOptions(
+                endpoint="http://api",
+                codec=TestCodec(event=_event()),
+                subscriber=sub,
+                validate_topics=False,
+            )
+        )
+        worker.handle_topic(TOPIC, _noop_handler)
+        senders = []
+
+        def update_status(log_id, status, message, ctx):
+            senders.append(threading.current_thread().name)
+
+        with mock.patch.object(
+            worker.event_logs_client(), "update_status", side_effect=update_status
+        ):
+            worker.close()
+            self._run_until_delivered(worker, sub)
+
+        self.assertEqual(senders, ["relaymesh-event-log"])
+
+    def test_close_flushes_queued_status_updates(self):
+        worker = Worker(WorkerOptions(endpoint="http://api"))
+        ctx = WorkerContext(tenant_id="acme")
+        with mock.patch.object(worker.event_logs_client(), "update_status") as update:
+            worker.update_event_log_status(ctx, "log-1", EVENT_LOG_STATUS_SUCCESS, None)
+            worker.update_event_log_status(
+                ctx, "log-2", EVENT_LOG_STATUS_FAILED, ValueError("boom")
+            )
+            worker.close()
+
         self.assertEqual(
-            status_calls,
-            [("log-3", EVENT_LOG_STATUS_FAILED, "decode failed")],
+            update.call_args_list,
+            [
+                mock.call("log-1", EVENT_LOG_STATUS_SUCCESS, "", ctx),
+                mock.call("log-2", EVENT_LOG_STATUS_FAILED, "boom", ctx),
+            ],
+        )
+
+    def test_update_after_close_is_sent_inline(self):
+        worker = Worker(WorkerOptions(endpoint="http://api"))
+        ctx = WorkerContext(tenant_id="acme")
+        with mock.patch.object(worker.event_logs_client(), "update_status") as update:
+            worker.close()
+            worker.update_event_log_status(ctx, "log-1", EVENT_LOG_STATUS_SUCCESS, None)
+
+            update.assert_called_once_with("log-1", EVENT_LOG_STATUS_SUCCESS, "", ctx)
+        self.assertIsNone(worker._status_sender)
+
+    def test_close_sends_backlog_inline_when_queue_stays_full(self):
+        logger = mock.Mock(spec=["printf"])
+        worker = Worker(WorkerOptions(endpoint="http://api", logger=logger))
+        ctx = WorkerContext(tenant_id="acme")
+        sending = threading.Event()
+        release = threading.Event()
+
+        def update_status(log_id, status, message, ctx):
+            if log_id == "log-1":
+                sending.set()
+                release.wait(5)
+
+        with mock.patch("relaymesh.worker.STATUS_QUEUE_SIZE", 1), mock.patch(
+            "relaymesh.worker.STATUS_DRAIN_TIMEOUT_SECONDS", 0.05
+        ), mock.patch.object(
+            worker.event_logs_client(), "update_status", side_effect=update_status
+        ) as update:
+            worker.update_event_log_status(ctx, "log-1", EVENT_LOG_STATUS_SUCCESS, None)
+            self.assertTrue(sending.wait(5))
+            worker.update_event_log_status(ctx, "log-2", EVENT_LOG_STATUS_SUCCESS, None)
+            worker.close()
+            sent_by_close = [c.args[0] for c in update.call_args_list]
+            release.set()
+
+        self.assertEqual(sent_by_close, ["log-1", "log-2"])
+        logger.printf.assert_called_once_with(
+            "event log status queue full at close; sending %d updates inline", 1
         )
 
 